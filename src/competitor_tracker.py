@@ -10,6 +10,7 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import json
 import os
+from secret_store import get_secret
 
 logger = logging.getLogger('CompetitorTracker')
 
@@ -33,27 +34,11 @@ class PolymarketTracker:
             self._load_credentials()
     
     def _load_credentials(self):
-        """Load credentials from pass"""
+        """Load credentials from pass (decrypted once per process, shared by every tracker)"""
         try:
-            import subprocess
-            
-            result = subprocess.run(
-                ['pass', 'show', 'polymarket/api_key'],
-                capture_output=True, text=True
-            )
-            self.api_key = result.stdout.strip().split('\n')[0]
-            
-            result = subprocess.run(
-                ['pass', 'show', 'polymarket/api_secret'],
-                capture_output=True, text=True
-            )
-            self.api_secret = result.stdout.strip().split('\n')[0]
-            
-            result = subprocess.run(
-                ['pass', 'show', 'polymarket/passphrase'],
-                capture_output=True, text=True
-            )
-            self.passphrase = result.stdout.strip().split('\n')[0]
+            self.api_key = get_secret('polymarket/api_key')
+            self.api_secret = get_secret('polymarket/api_secret')
+            self.passphrase = get_secret('polymarket/passphrase')
             
             logger.info("✅ Loaded Polymarket credentials from pass")
         except Exception as e:
@@ -569,13 +569,8 @@ class MarketScanner:
         """Fetch weather forecast using OpenWeather API"""
         # Initialize WeatherAPI on first call
         if not hasattr(self, '_weather_api'):
-            import subprocess
-            result = subprocess.run(
-                ['pass', 'show', 'openweather/api-key'],
-                capture_output=True, text=True
-            )
-            api_key = result.stdout.strip().splitlines()[0]
-            self._weather_api = WeatherAPI(api_key)
+            from secret_store import get_secret
+            self._weather_api = WeatherAPI(get_secret('openweather/api-key'))
         
         return await self._weather_api.fetch_forecast(city, lat, lon)
     
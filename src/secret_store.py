@@ -0,0 +1,26 @@
+"""
+Secret Store - cached lookups from the `pass` password store
+Each secret is decrypted at most once per process
+"""
+
+import subprocess
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def get_secret(path: str) -> str:
+    """
+    Get the first line of a `pass` entry
+    
+    Successful lookups are cached for the life of the process, so every
+    strategy sharing a secret pays for one GPG decrypt. Failures raise and
+    are not cached.
+    
+    Args:
+        path: pass entry, e.g. 'openweather/api-key'
+    """
+    result = subprocess.run(
+        ['pass', 'show', path],
+        capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[0]
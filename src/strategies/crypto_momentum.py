@@ -5,6 +5,7 @@ Tracks and copies successful competitor trades on 15-min crypto markets
 """
 
 from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
 from strategy_framework import BaseStrategy
 from datetime import datetime, timedelta, timezone
 import logging
@@ -12,6 +13,7 @@ import aiohttp
 import asyncio
 import json
 import os
+import time
 
 logger = logging.getLogger('CryptoMomentum')
 from position_monitor import PositionMonitor
@@ -21,6 +23,20 @@ def clamp(value, min_val, max_val):
     """Clamp value between min and max"""
     return max(min_val, min(max_val, value))
 
+@dataclass(slots=True)
+class Opportunity:
+    """A crypto 15M market where the model disagrees with the orderbook"""
+    ticker: str
+    side: str  # 'YES' or 'NO'
+    market_up: float
+    market_down: float
+    model_up: float
+    model_down: float
+    best_edge: float
+    entry_price: float  # 0-1
+    asset: str
+
+
 class CryptoMomentumStrategy(BaseStrategy):
     """
     Focused on BTC/ETH/SOL 15M markets with competitor copying
@@ -60,6 +76,12 @@ class CryptoMomentumStrategy(BaseStrategy):
         self._load_candles()
         
         self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Single-flight gate for CoinGecko - candles are minute resolution,
+        # so concurrent/bursty callers share one fetch per minute
+        self._cg_lock = asyncio.Lock()
+        self._cg_last = 0.0
+        self._cg_min_interval = 55
     
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
@@ -92,27 +114,34 @@ class CryptoMomentumStrategy(BaseStrategy):
             logger.warning(f"Failed to save candles: {e}")
     
     async def fetch_1m_candles(self):
-        """Fetch 1-minute candles for all crypto assets"""
-        try:
-            session = await self._get_session()
+        """Fetch 1-minute candles for all crypto assets (at most once per minute)"""
+        async with self._cg_lock:
+            now_mono = time.monotonic()
+            if now_mono - self._cg_last < self._cg_min_interval:
+                return
             
-            # Fetch BTC
-            url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,solana&vs_currencies=usd"
-            
-            async with asyncio.timeout(10):
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        now = datetime.now()
-                        
-                        for asset, key in [('BTC', 'bitcoin'), ('ETH', 'ethereum'), ('SOL', 'solana')]:
-                            if key in data:
-                                price = data[key]['usd']
-                                self._update_asset_candles(asset, price, now)
-                        
-                        self._save_candles()
-        except Exception as e:
-            logger.warning(f"Failed to fetch prices: {e}")
+            try:
+                session = await self._get_session()
+                
+                # Fetch BTC
+                url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,solana&vs_currencies=usd"
+                
+                async with asyncio.timeout(10):
+                    async with session.get(url) as resp:
+                        if resp.status == 200:
+                            data = await resp.json()
+                            # Only a successful fetch closes the gate - failures retry on the next call
+                            self._cg_last = now_mono
+                            now = datetime.now()
+                            
+                            for asset, key in [('BTC', 'bitcoin'), ('ETH', 'ethereum'), ('SOL', 'solana')]:
+                                if key in data:
+                                    price = data[key]['usd']
+                                    self._update_asset_candles(asset, price, now)
+                            
+                            self._save_candles()
+            except Exception as e:
+                logger.warning(f"Failed to fetch prices: {e}")
     
     def _update_asset_candles(self, asset: str, price: float, now: datetime):
         info = self.assets[asset]
@@ -151,14 +180,14 @@ class CryptoMomentumStrategy(BaseStrategy):
     def compute_vwap(self, candles: List[Dict]) -> float:
         if not candles:
             return 0.0
+        # Single pass; the /3 of the typical price is factored out of the sum
         total_pv = 0.0
         total_vol = 0.0
         for c in candles:
-            typical_price = (c['high'] + c['low'] + c['close']) / 3
             volume = c.get('volume', 1.0)
-            total_pv += typical_price * volume
+            total_pv += (c['high'] + c['low'] + c['close']) * volume
             total_vol += volume
-        return total_pv / total_vol if total_vol > 0 else 0.0
+        return total_pv / (3 * total_vol) if total_vol > 0 else 0.0
     
     def compute_rsi(self, prices: List[float], period: int = 14) -> float:
         if len(prices) < period + 1:
@@ -211,7 +240,46 @@ class CryptoMomentumStrategy(BaseStrategy):
         total = up + down
         return (up - down) / total if total > 0 else 0.0
     
-    async def analyze(self) -> List[Dict]:
+    def _get_open_markets(self, series: str) -> List[Dict]:
+        """Fetch markets for a series, filtered to those currently open"""
+        response = self.client._request("GET", f"/markets?series_ticker={series}&status=open")
+        all_markets = response.json().get('markets', [])
+        
+        now = datetime.now(timezone.utc)
+        markets = []
+        
+        for m in all_markets:
+            open_str = m.get('open_time', '')
+            close_str = m.get('close_time', '')
+            
+            if open_str and close_str:
+                try:
+                    # Python 3.11+ parses the trailing 'Z' natively (asyncio.timeout already needs 3.11)
+                    open_time = datetime.fromisoformat(open_str)
+                    close_time = datetime.fromisoformat(close_str)
+                    
+                    if open_time <= now < close_time:
+                        markets.append(m)
+                except:
+                    pass
+        
+        return markets
+    
+    async def _batch_orderbooks(self, tickers: List[str]) -> List[Optional[Dict]]:
+        """
+        Fetch orderbooks for several tickers concurrently
+        
+        Kalshi has no multi-ticker orderbook endpoint, so requests are issued
+        in parallel over the client's pooled session - latency is the slowest
+        request rather than the sum of all of them.
+        """
+        results = await asyncio.gather(
+            *[asyncio.to_thread(self.client.get_orderbook, t) for t in tickers],
+            return_exceptions=True
+        )
+        return [None if isinstance(r, Exception) else r for r in results]
+    
+    async def analyze(self) -> List[Opportunity]:
         """Analyze all crypto assets for opportunities"""
         opportunities = []
         
@@ -226,47 +294,30 @@ class CryptoMomentumStrategy(BaseStrategy):
             if len(candles) < 10:
                 continue
             
-            current_price = candles[-1]['close']
-            vwap = self.compute_vwap(candles)
-            
-            # Score direction
-            direction_score = self.score_direction(candles, vwap, current_price)
-            
-            # Convert to probabilities
-            model_up = clamp(0.5 + direction_score * 0.3, 0.1, 0.9)
-            model_down = 1 - model_up
-            
-            # Get markets for this asset
             try:
-                response = self.client._request("GET", f"/markets?series_ticker={info['series']}&status=open")
-                all_markets = response.json().get('markets', [])
+                # Get markets first - skip indicator math when nothing is open
+                markets = self._get_open_markets(info['series'])
+                if not markets:
+                    continue
                 
-                # Filter to only currently open markets
-                now = datetime.now(timezone.utc)
-                markets = []
+                current_price = candles[-1]['close']
+                vwap = self.compute_vwap(candles)
                 
-                for m in all_markets:
-                    open_str = m.get('open_time', '')
-                    close_str = m.get('close_time', '')
-                    
-                    if open_str and close_str:
-                        try:
-                            open_time = datetime.fromisoformat(open_str.replace('Z', '+00:00'))
-                            close_time = datetime.fromisoformat(close_str.replace('Z', '+00:00'))
-                            
-                            if open_time <= now < close_time:
-                                markets.append(m)
-                        except:
-                            pass
+                # Score direction
+                direction_score = self.score_direction(candles, vwap, current_price)
                 
-                if markets:
-                    logger.info(f"📊 {asset}: Found {len(markets)} open markets (model: {model_up:.0%} up)")
+                # Convert to probabilities
+                model_up = clamp(0.5 + direction_score * 0.3, 0.1, 0.9)
+                model_down = 1 - model_up
                 
-                for market in markets:
-                    ticker = market['ticker']
-                    
+                logger.info(f"📊 {asset}: Found {len(markets)} open markets (model: {model_up:.0%} up)")
+                
+                # Fetch all of this asset's orderbooks concurrently
+                tickers = [m['ticker'] for m in markets]
+                orderbooks = await self._batch_orderbooks(tickers)
+                
+                for ticker, orderbook in zip(tickers, orderbooks):
                     try:
-                        orderbook = self.client.get_orderbook(ticker)
                         if not orderbook or 'orderbook' not in orderbook:
                             continue
                         
@@ -308,17 +359,17 @@ class CryptoMomentumStrategy(BaseStrategy):
                         if entry_price > 0.60:
                             continue
                         
-                        opportunities.append({
-                            'ticker': ticker,
-                            'side': best_side,
-                            'market_up': market_up,
-                            'market_down': market_down,
-                            'model_up': model_up,
-                            'model_down': model_down,
-                            'best_edge': best_edge,
-                            'entry_price': entry_price,
-                            'asset': asset
-                        })
+                        opportunities.append(Opportunity(
+                            ticker=ticker,
+                            side=best_side,
+                            market_up=market_up,
+                            market_down=market_down,
+                            model_up=model_up,
+                            model_down=model_down,
+                            best_edge=best_edge,
+                            entry_price=entry_price,
+                            asset=asset
+                        ))
                         
                         logger.info(f"✅ {asset} OPPORTUNITY: {ticker} {best_side} | Edge={best_edge:.1%}")
                         
@@ -330,7 +381,7 @@ class CryptoMomentumStrategy(BaseStrategy):
         
         return opportunities
     
-    async def execute(self, opportunities: List[Dict]) -> int:
+    async def execute(self, opportunities: List[Opportunity]) -> int:
         """Execute trades with consensus"""
         executed = 0
         
@@ -344,16 +395,16 @@ class CryptoMomentumStrategy(BaseStrategy):
             consensus = None
         
         for opp in opportunities:
-            ticker = opp['ticker']
-            side = opp['side']
-            entry_price_cents = int(opp['entry_price'] * 100)
+            ticker = opp.ticker
+            side = opp.side
+            entry_price_cents = int(opp.entry_price * 100)
             
             # Check for existing position
             if self.position_manager and self.position_manager.has_open_position(ticker, self.dry_run):
                 continue
             
             # Position sizing based on edge
-            edge = opp['best_edge']
+            edge = opp.best_edge
             if edge >= 0.20:
                 contracts = 5
             elif edge >= 0.10:
@@ -11,15 +11,134 @@ Strategy:
 Markets: London, NYC, Seoul (original bot cities)
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from strategy_framework import BaseStrategy
-from datetime import datetime, timedelta
+from weather_api import OpenMeteoProvider
+from weather_cache import WeatherCache
+from secret_store import get_secret
+from datetime import date, datetime, timedelta
+from dataclasses import dataclass
+from operator import itemgetter, methodcaller
 import logging
 import aiohttp
 import asyncio
+import os
+import re
+import time
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 logger = logging.getLogger('LongshotWeather')
 
+# Market title/ticker patterns, compiled once
+_RE_THRESH = re.compile(r'[><](\d+)')  # >37 or <30
+_RE_RANGE = re.compile(r'(\d+)-(\d+)')  # 29-30
+# KXHIGHNY-26FEB03-T37 / -B29.5: year, month, day, then threshold (T) or range midpoint (B)
+_RE_MARKET_TICKER = re.compile(r'-(\d{2})([A-Z]{3})(\d{2})-(?:T(\d+(?:\.\d+)?)|B(\d+(?:\.\d+)?))?')
+
+# Known temperature series -> city (key into LongshotWeatherStrategy.cities).
+# A market's series is its ticker up to the first '-', e.g. KXHIGHNY-26FEB03-T37
+SERIES_TO_CITY = {
+    'KXHIGHNY': 'New York',
+    'KXHIGHCHI': 'Chicago',
+    'KXHIGHPHIL': 'Philadelphia',
+    'KXHIGHLAX': 'Los Angeles',
+}
+
+# Fallback cities for titles that match no configured kalshi_key:
+# (name, lowercased name, coords), lowercased once here instead of per market
+_CITY_PATTERNS = tuple(
+    (name, name.lower(), coords) for name, coords in {
+        'New York': {'lat': 40.7128, 'lon': -74.0060},
+        'Chicago': {'lat': 41.8781, 'lon': -87.6298},
+        'Philadelphia': {'lat': 39.9526, 'lon': -75.1652},
+        'Los Angeles': {'lat': 34.0522, 'lon': -118.2437},
+        'Seattle': {'lat': 47.6062, 'lon': -122.3321},
+        'Houston': {'lat': 29.7604, 'lon': -95.3698},
+        'Miami': {'lat': 25.7617, 'lon': -80.1918},
+        'Boston': {'lat': 42.3601, 'lon': -71.0589},
+        'Denver': {'lat': 39.7392, 'lon': -104.9903},
+        'Atlanta': {'lat': 33.7490, 'lon': -84.3880},
+        'Phoenix': {'lat': 33.4484, 'lon': -112.0740},
+        'London': {'lat': 51.5074, 'lon': -0.1278},
+        'Seoul': {'lat': 37.5665, 'lon': 126.9780},
+        'Tokyo': {'lat': 35.6762, 'lon': 139.6503},
+    }.items()
+)
+
+_MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
+}
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _day_number_to_date(day_number: int) -> str:
+    """'YYYY-MM-DD' for a day count since the Unix epoch (no strftime/tz work)"""
+    return date.fromordinal(_EPOCH_ORDINAL + day_number).isoformat()
+
+
+def _best_price_cents(levels) -> Optional[int]:
+    """
+    Best (highest) bid in cents from one side of a Kalshi orderbook, or None if empty
+    
+    Levels come as [[price_cents, volume], ...] or [{'price': ...}, ...],
+    sorted by ascending price - the best bid is the last level.
+    """
+    if not levels:
+        return None
+    return _orderbook_row_parser(levels[-1])(levels[-1])
+
+
+def _orderbook_row_parser(row) -> Callable:
+    """Price-in-cents accessor for the orderbook level format `row` is in"""
+    if isinstance(row, dict):
+        return _dict_row_price
+    return _list_row_price
+
+
+_list_row_price = itemgetter(0)
+_dict_row_price = methodcaller('get', 'price')
+
+
+def _prob_with_deviation(forecast_high: float, forecast_low: float, threshold: float,
+                         is_above: bool, deviation: float) -> float:
+    """
+    Probability of crossing threshold given a ±deviation forecast band
+    
+    Linear across the band [forecast - deviation, forecast + deviation] and
+    clamped to [0.15, 0.85] outside it. Above markets use the forecast high,
+    below markets the forecast low with the direction flipped.
+    """
+    if is_above:
+        prob = 0.5 + (forecast_high - threshold) / (2 * deviation)
+    else:
+        prob = 0.5 + (threshold - forecast_low) / (2 * deviation)
+    return max(0.15, min(0.85, prob))
+
+
+@dataclass(slots=True)
+class MarketCandidate:
+    """A liquid weather market carried through one scan (filled in place, never copied)"""
+    ticker: str
+    title: str
+    yes_price: float
+    no_price: float
+    volume: float
+    city: str
+    city_data: Dict
+    threshold: float
+    is_above: Optional[bool]  # None for range markets
+    forecast_date: str
+    market_price: float = 0.0
+    side: str = ''
+
 
 class LongshotWeatherStrategy(BaseStrategy):
     """
@@ -39,6 +158,9 @@ class LongshotWeatherStrategy(BaseStrategy):
         
         # Strategy parameters (from $64K bot)
         self.max_market_price = 0.20  # Only markets < 20¢ (adjusted for Kalshi)
+        # Slack over max_market_price when pre-filtering on the (up to
+        # _markets_ttl old) top-of-book in the markets payload
+        self.prefilter_buffer_cents = 5
         self.min_liquidity = 50  # $50 minimum
         self.deviation_f = 3.5  # ±3.5°F deviation
         self.min_edge = 0.20  # Minimum 20% edge for cheap markets
@@ -54,71 +176,307 @@ class LongshotWeatherStrategy(BaseStrategy):
             'Houston': {'lat': 29.7604, 'lon': -95.3698, 'kalshi_key': ['HOU', 'Houston']},
         }
         
+        # Flat lowercase kalshi_key -> city index, plus one alternation regex over
+        # all keys so matching is a single C-level scan per string. The lookahead
+        # reports overlapping matches; the winner is picked by self.cities order
+        # (short keys like 'hou'/'sea' also occur inside ordinary words)
+        self._key_to_city = {
+            key.lower(): city
+            for city, data in self.cities.items()
+            for key in data.get('kalshi_key', [])
+        }
+        self._city_rank = {city: i for i, city in enumerate(self.cities)}
+        self._city_key_re = re.compile(
+            '(?=(' + '|'.join(re.escape(k) for k in sorted(self._key_to_city, key=len, reverse=True)) + '))'
+        )
+        
         self.session: Optional[aiohttp.ClientSession] = None
+        # Separate long-lived pool for Kalshi read calls (see _kalshi_get)
+        self._kalshi_session: Optional[aiohttp.ClientSession] = None
+        
+        # OpenWeather API key - resolved once, then reused for every fetch
+        self._api_key: Optional[str] = None
+        self._api_key_lock = asyncio.Lock()
+        
+        # Forecast cache: city -> (fetched_at, daily forecast). OpenWeather
+        # only refreshes every few hours, so reuse across scans
+        self._forecast_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._forecast_ttl = 1800  # 30 minutes
+        # ...and on disk, so restarts inside the TTL don't refetch
+        self.weather_cache = WeatherCache()
+        self._onecall_available = True  # Flipped off on first 401 from One Call 3.0
+        # Last failure per forecast provider; a failed provider is skipped for
+        # _weather_backoff seconds instead of being retried on every call
+        self._weather_failure_at: Dict[str, float] = {}
+        self._weather_backoff = 60
+        
+        # Short-lived orderbook cache: ticker -> (fetched_at, orderbook)
+        self._orderbook_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._orderbook_ttl = 15
+        self._ob_parser: Optional[Callable] = None  # Resolved from the first non-empty book
+        # Tickers seen with an empty side: ticker -> seen_at
+        self._orderbook_negative: Dict[str, float] = {}
+        self._orderbook_negative_ttl = 120
+        
+        # Cap on concurrent Kalshi REST calls - sized to the keep-alive pool in
+        # _get_kalshi_session (and requests' default pool for the thread path)
+        self._kalshi_concurrency = 10
+        self._kalshi_sem = asyncio.Semaphore(self._kalshi_concurrency)
+        
+        # Market discovery cache: (fetched_at, value)
+        self._series_cache: Optional[Tuple[float, List[str]]] = None
+        self._series_ttl = 3600  # Series list rarely changes
+        self._markets_cache: Optional[Tuple[float, List[Dict]]] = None
+        self._markets_ttl = 300
         
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            # Bounded keep-alive pool with cached DNS for the weather APIs
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
         return self.session
     
+    async def _get_kalshi_session(self) -> aiohttp.ClientSession:
+        if self._kalshi_session is None or self._kalshi_session.closed:
+            self._kalshi_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._kalshi_concurrency, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._kalshi_session
+    
+    async def _get_api_key(self) -> Optional[str]:
+        """
+        Get OpenWeather API key (env var first, then `pass`)
+        
+        The `pass` lookup forks a GPG decrypt; get_secret caches it per process
+        and the lock stops concurrent fetches racing to do it.
+        """
+        if self._api_key:
+            return self._api_key
+        
+        async with self._api_key_lock:
+            if self._api_key:
+                return self._api_key
+            if self._weather_backing_off('openweather'):
+                return None
+            
+            api_key = os.environ.get('OPENWEATHER_API_KEY')
+            if not api_key:
+                try:
+                    api_key = await asyncio.to_thread(get_secret, 'openweather/api-key')
+                except Exception:
+                    logger.error(f"Could not get OpenWeather API key")
+                    self._weather_failure_at['openweather'] = time.time()
+                    return None
+            
+            self._api_key = api_key
+            return api_key
+    
     async def fetch_weather_forecast(self, city: str, lat: float, lon: float) -> Optional[Dict]:
-        """Fetch weather forecast from OpenWeather"""
-        import subprocess
+        """Fetch weather forecast from OpenWeather (cached for _forecast_ttl)"""
+        now = time.time()
+        cached = self._get_cached_forecast(city, lat, lon, now)
+        if cached:
+            return cached
         
-        try:
-            api_key = subprocess.run(
-                ['pass', 'show', 'openweather/api-key'],
-                capture_output=True, text=True
-            ).stdout.strip().splitlines()[0]
-        except:
-            logger.error(f"Could not get OpenWeather API key")
+        if self._weather_backing_off('openweather'):
+            return None
+        
+        api_key = await self._get_api_key()
+        if not api_key:
             return None
         
         session = await self._get_session()
         
         try:
-            url = (
-                f"https://api.openweathermap.org/data/2.5/forecast?"
-                f"lat={lat}&lon={lon}&appid={api_key}&units=imperial"
-            )
+            result = None
+            if self._onecall_available:
+                result = await self._fetch_onecall_daily(session, lat, lon, api_key)
+            if result is None:
+                result = await self._fetch_3h_forecast_daily(session, lat, lon, api_key)
             
-            async with session.get(url, timeout=10) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    
-                    # Extract daily forecasts
-                    daily_temps = {}
-                    for item in data.get('list', []):
-                        dt = datetime.fromtimestamp(item['dt'])
-                        date_str = dt.strftime('%Y-%m-%d')
-                        
-                        if date_str not in daily_temps:
-                            daily_temps[date_str] = {'highs': [], 'lows': [], 'avgs': []}
-                        
-                        temp = item['main']['temp']
-                        temp_max = item['main']['temp_max']
-                        temp_min = item['main']['temp_min']
-                        
-                        daily_temps[date_str]['avgs'].append(temp)
-                        daily_temps[date_str]['highs'].append(temp_max)
-                        daily_temps[date_str]['lows'].append(temp_min)
-                    
-                    # Calculate daily stats
-                    result = {}
-                    for date, temps in daily_temps.items():
-                        result[date] = {
-                            'high': max(temps['highs']),
-                            'low': min(temps['lows']),
-                            'avg': sum(temps['avgs']) / len(temps['avgs'])
-                        }
-                    
-                    return result
-                    
+            if result:
+                self._store_forecast(city, lat, lon, now, result)
+                return result
+                
         except Exception as e:
             logger.debug(f"Weather fetch error for {city}: {e}")
         
+        self._weather_failure_at['openweather'] = time.time()
         return None
     
+    def _weather_backing_off(self, provider: str) -> bool:
+        """True if `provider` failed within the last _weather_backoff seconds"""
+        return time.time() - self._weather_failure_at.get(provider, 0) < self._weather_backoff
+    
+    def _has_fresh_forecasts(self) -> bool:
+        """True if any city has a forecast within TTL, in memory or (e.g. after a restart) on disk"""
+        now = time.time()
+        if any(now - fetched_at < self._forecast_ttl for fetched_at, _ in self._forecast_cache.values()):
+            return True
+        # Disk hits are promoted to memory, so this only reads SQLite until one is found
+        return any(
+            self._get_cached_forecast(city, data['lat'], data['lon'], now)
+            for city, data in self.cities.items()
+        )
+    
+    async def _fetch_forecasts(self, city_coords: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Forecasts for several cities, fetched concurrently
+        
+        One Open-Meteo call fills the cache for all of them; OpenWeather
+        only gets hit for cities it couldn't cover. Cities with no forecast are omitted.
+        """
+        cities = list(city_coords)
+        await self._prefetch_forecasts(city_coords)
+        results = await asyncio.gather(
+            *[self.fetch_weather_forecast(c, city_coords[c]['lat'], city_coords[c]['lon']) for c in cities],
+            return_exceptions=True
+        )
+        return {
+            c: r for c, r in zip(cities, results) if r and not isinstance(r, Exception)
+        }
+    
+    async def _prefetch_forecasts(self, city_coords: Dict[str, Dict]):
+        """Fill the forecast cache for all stale cities with a single Open-Meteo request"""
+        now = time.time()
+        stale = {
+            city: coords for city, coords in city_coords.items()
+            if not self._get_cached_forecast(city, coords['lat'], coords['lon'], now)
+        }
+        if not stale or self._weather_backing_off('open-meteo'):
+            return
+        
+        session = await self._get_session()
+        forecasts = await OpenMeteoProvider(stale).fetch_all(session)
+        if not forecasts:
+            self._weather_failure_at['open-meteo'] = time.time()
+        for city, forecast in forecasts.items():
+            if forecast:
+                self._store_forecast(city, stale[city]['lat'], stale[city]['lon'], now, forecast)
+    
+    def _get_cached_forecast(self, city: str, lat: float, lon: float, now: float) -> Optional[Dict]:
+        """
+        Fresh forecast from memory, else from the on-disk cache, else None
+        
+        A disk hit is copied into memory with its original fetch time, so the
+        TTL still counts from the real fetch and later calls skip SQLite.
+        """
+        cached = self._forecast_cache.get(city)
+        if cached and now - cached[0] < self._forecast_ttl:
+            return cached[1]
+        try:
+            entry = self.weather_cache.get_entry(f"longshot:{city}", lat, lon)
+        except Exception as e:
+            logger.debug(f"Weather cache read error for {city}: {e}")
+            return None
+        if not entry:
+            return None
+        forecast, cached_at = entry
+        fetched_at = cached_at.timestamp()
+        if now - fetched_at >= self._forecast_ttl:
+            return None
+        self._forecast_cache[city] = (fetched_at, forecast)
+        return forecast
+    
+    def _store_forecast(self, city: str, lat: float, lon: float, now: float, forecast: Dict):
+        """Store a daily forecast in memory and on disk for _forecast_ttl"""
+        self._forecast_cache[city] = (now, forecast)
+        try:
+            # Namespaced key - WeatherAPI stores a different format under the bare city name
+            self.weather_cache.set(f"longshot:{city}", lat, lon, forecast, ttl_hours=self._forecast_ttl / 3600)
+        except Exception as e:
+            logger.debug(f"Weather cache write error for {city}: {e}")
+    
+    async def _fetch_onecall_daily(self, session: aiohttp.ClientSession, lat: float,
+                                   lon: float, api_key: str) -> Optional[Dict]:
+        """
+        Fetch the daily block from One Call 3.0 - already aggregated by OpenWeather,
+        and excluding everything else keeps the payload small.
+        Disables itself on 401 (key has no 3.0 subscription).
+        """
+        url = (
+            f"https://api.openweathermap.org/data/3.0/onecall?"
+            f"lat={lat}&lon={lon}&exclude=current,minutely,hourly,alerts"
+            f"&appid={api_key}&units=imperial"
+        )
+        
+        async with session.get(url) as resp:
+            if resp.status == 401:
+                logger.info("  LongshotWeather: One Call 3.0 not available, using 2.5 forecast")
+                self._onecall_available = False
+                return None
+            if resp.status != 200:
+                return None
+            data = _json_loads(await resp.read())
+        
+        tz_offset = data.get('timezone_offset', 0)
+        result = {}
+        for day in data.get('daily', []):
+            temp = day['temp']
+            date_str = _day_number_to_date((day['dt'] + tz_offset) // 86400)
+            result[date_str] = {
+                'high': temp['max'],
+                'low': temp['min'],
+                # temp['day'] is the midday reading - average the four daily
+                # samples to match the 2.5 path's and Open-Meteo's daily mean
+                'avg': (temp['morn'] + temp['day'] + temp['eve'] + temp['night']) / 4
+            }
+        return result
+    
+    async def _fetch_3h_forecast_daily(self, session: aiohttp.ClientSession, lat: float,
+                                       lon: float, api_key: str) -> Optional[Dict]:
+        """Fetch the 2.5 5-day/3-hour forecast and aggregate it into daily stats"""
+        url = (
+            f"https://api.openweathermap.org/data/2.5/forecast?"
+            f"lat={lat}&lon={lon}&appid={api_key}&units=imperial"
+        )
+        
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                return None
+            data = _json_loads(await resp.read())
+        
+        # Extract daily forecasts - running [high, low, sum, count] per day.
+        # Bucket on an integer day number in the city's local time; the date
+        # string is only formatted once per day below
+        tz_offset = data.get('city', {}).get('timezone', 0)
+        daily_temps = {}
+        for item in data.get('list', []):
+            day_key = (item['dt'] + tz_offset) // 86400
+            
+            main = item['main']
+            temp = main['temp']
+            temp_max = main['temp_max']
+            temp_min = main['temp_min']
+            
+            e = daily_temps.get(day_key)
+            if e is None:
+                daily_temps[day_key] = [temp_max, temp_min, temp, 1]
+            else:
+                if temp_max > e[0]:
+                    e[0] = temp_max
+                if temp_min < e[1]:
+                    e[1] = temp_min
+                e[2] += temp
+                e[3] += 1
+        
+        # Calculate daily stats
+        result = {}
+        for day_key, (high, low, total, count) in daily_temps.items():
+            result[_day_number_to_date(day_key)] = {
+                'high': high,
+                'low': low,
+                'avg': total / count
+            }
+        return result
+    
     def calculate_probability_with_deviation(self, forecast_high: float, 
                                              forecast_low: float, threshold: float,
                                              is_above: bool = True) -> float:
@@ -128,38 +486,17 @@ class LongshotWeatherStrategy(BaseStrategy):
         This is the key insight from the $64K bot - weather forecasts
         have natural deviation, so we model probability as a range
         """
-        if is_above:
-            # Probability temp > threshold
-            # If forecast_high - deviation > threshold, high probability
-            # If forecast_high + deviation < threshold, low probability
-            
-            optimistic = forecast_high + self.deviation_f
-            pessimistic = forecast_high - self.deviation_f
-            
-            if pessimistic > threshold:
-                return 0.85  # Very likely
-            elif optimistic < threshold:
-                return 0.15  # Very unlikely
-            else:
-                # Linear interpolation between pessimistic and optimistic
-                range_size = optimistic - pessimistic
-                position = threshold - pessimistic
-                prob = 1 - (position / range_size)
-                return max(0.15, min(0.85, prob))
-        else:
-            # Probability temp < threshold
-            optimistic = forecast_low - self.deviation_f
-            pessimistic = forecast_low + self.deviation_f
-            
-            if pessimistic < threshold:
-                return 0.85
-            elif optimistic > threshold:
-                return 0.15
-            else:
-                range_size = optimistic - pessimistic
-                position = threshold - optimistic
-                prob = position / range_size
-                return max(0.15, min(0.85, prob))
+        return _prob_with_deviation(forecast_high, forecast_low, threshold, is_above, self.deviation_f)
+    
+    def calculate_probabilities_batch(self, highs: List[float], lows: List[float],
+                                      thresholds: List[float], is_above: List[bool]) -> List[float]:
+        """Batch form of calculate_probability_with_deviation over parallel lists"""
+        # Same model as _prob_with_deviation, inlined so there's no call per market
+        inv_band = 1.0 / (2 * self.deviation_f)
+        return [
+            max(0.15, min(0.85, 0.5 + ((h - t) if a else (t - l)) * inv_band))
+            for h, l, t, a in zip(highs, lows, thresholds, is_above)
+        ]
     
     def calculate_edge(self, fair_price: float, market_price: float) -> float:
         """
@@ -172,6 +509,13 @@ class LongshotWeatherStrategy(BaseStrategy):
             return 0
         return (fair_price - market_price) / market_price
     
+    def calculate_edges_batch(self, fair_prices: List[float], market_prices: List[float]) -> List[float]:
+        """Batch form of calculate_edge over parallel lists"""
+        return [
+            (f - m) / m if m > 0 else 0
+            for f, m in zip(fair_prices, market_prices)
+        ]
+    
     def extract_city_from_market(self, title: str, ticker: str) -> Optional[Tuple[str, Dict]]:
         """
         Dynamically extract city from market title/ticker
@@ -180,259 +524,428 @@ class LongshotWeatherStrategy(BaseStrategy):
         title_lower = title.lower()
         ticker_lower = ticker.lower()
         
-        # Check known cities first
-        for city, data in self.cities.items():
-            kalshi_keys = data.get('kalshi_key', [])
-            for key in kalshi_keys:
-                if key.lower() in title_lower or key.lower() in ticker_lower:
-                    return city, data
-        
-        # Try to extract city from title patterns
-        # Pattern: "high temp in [CITY]" or "[CITY] temperature"
-        import re
-        
-        # Common city names to check
-        city_patterns = {
-            'New York': {'lat': 40.7128, 'lon': -74.0060},
-            'Chicago': {'lat': 41.8781, 'lon': -87.6298},
-            'Philadelphia': {'lat': 39.9526, 'lon': -75.1652},
-            'Los Angeles': {'lat': 34.0522, 'lon': -118.2437},
-            'Seattle': {'lat': 47.6062, 'lon': -122.3321},
-            'Houston': {'lat': 29.7604, 'lon': -95.3698},
-            'Miami': {'lat': 25.7617, 'lon': -80.1918},
-            'Boston': {'lat': 42.3601, 'lon': -71.0589},
-            'Denver': {'lat': 39.7392, 'lon': -104.9903},
-            'Atlanta': {'lat': 33.7490, 'lon': -84.3880},
-            'Phoenix': {'lat': 33.4484, 'lon': -112.0740},
-            'London': {'lat': 51.5074, 'lon': -0.1278},
-            'Seoul': {'lat': 37.5665, 'lon': 126.9780},
-            'Tokyo': {'lat': 35.6762, 'lon': 139.6503},
+        # Check known cities first, in self.cities priority order
+        found = {
+            self._key_to_city[m.group(1)]
+            for text in (title_lower, ticker_lower)
+            for m in self._city_key_re.finditer(text)
         }
+        if found:
+            city = min(found, key=self._city_rank.__getitem__)
+            return city, self.cities[city]
         
-        for city_name, coords in city_patterns.items():
-            if city_name.lower() in title_lower:
+        # Fall back to other cities we can forecast, by name in the title
+        for city_name, name_lower, coords in _CITY_PATTERNS:
+            if name_lower in title_lower:
                 return city_name, coords
         
         return None, None
     
-    async def scan(self) -> List[Dict]:
-        """Scan for longshot weather opportunities - DYNAMIC DISCOVERY"""
-        opportunities = []
+    def _parse_market(self, title: str, ticker: str) -> Optional[Dict]:
+        """
+        Extract everything the analysis needs from a market's title/ticker, once
         
-        logger.info("  LongshotWeather: Dynamically discovering liquid weather markets...")
+        Returns {'city', 'city_data', 'threshold', 'is_above', 'forecast_date'}
+        or None if the market can't be analysed (no city, threshold or date).
+        is_above is None for range markets.
+        """
+        # Series prefix is a dict lookup; only fall back to title/ticker matching on a miss
+        city = SERIES_TO_CITY.get(ticker.partition('-')[0])
+        if city:
+            city_data = self.cities[city]
+        else:
+            city, city_data = self.extract_city_from_market(title, ticker)
+            if not city or not city_data:
+                return None
         
-        # Fetch ALL climate/weather series dynamically
+        # Date and strike in one pass over the ticker, e.g. KXHIGHNY-26FEB03-T37
+        # (T = threshold, B = range midpoint)
+        match = _RE_MARKET_TICKER.search(ticker)
+        if not match:
+            return None
+        year, month_str, day, strike, range_mid = match.groups()
+        month = _MONTHS.get(month_str)
+        if month is None:
+            return None  # Unrecognised month code - don't guess a date
+        
+        if strike is not None:
+            # Threshold market - the title's >/< only gives the direction
+            if '>' in title:
+                is_above = True
+            elif '<' in title:
+                is_above = False
+            else:
+                return None
+            threshold = float(strike)
+        elif range_mid is not None:
+            threshold = float(range_mid)
+            is_above = None  # Range market
+        else:
+            # No strike suffix - fall back to the title (e.g. ">37°" or "29-30°")
+            match = _RE_THRESH.search(title)
+            if match:
+                threshold = int(match.group(1))
+                is_above = '>' in title
+            else:
+                match = _RE_RANGE.search(title)
+                if not match:
+                    return None
+                threshold = (int(match.group(1)) + int(match.group(2))) / 2
+                is_above = None  # Range market
+        
+        return {
+            'city': city,
+            'city_data': city_data,
+            'threshold': threshold,
+            'is_above': is_above,
+            'forecast_date': f"20{year}-{month:02d}-{day}"
+        }
+    
+    async def _kalshi_call(self, fn, *args):
+        """Run a blocking KalshiClient call off the event loop, at most _kalshi_concurrency at once"""
+        async with self._kalshi_sem:
+            return await asyncio.to_thread(fn, *args)
+    
+    async def _kalshi_get(self, endpoint: str) -> Optional[Dict]:
+        """
+        Authenticated Kalshi GET on the event loop, JSON body or None if not 200
+        
+        Signed the same way as KalshiClient._request, but sent over a pooled
+        aiohttp session so hot read paths (discovery, orderbooks, fills) skip
+        the worker-thread hop. Orders still go through the sync client.
+        """
+        client = self.client
+        full_path = f"{client.API_PREFIX}{endpoint}"
+        timestamp = str(int(time.time() * 1000))
+        headers = {
+            "Content-Type": "application/json",
+            "KALSHI-ACCESS-KEY": client.api_key_id,
+            "KALSHI-ACCESS-SIGNATURE": client._create_signature(timestamp, "GET", full_path),
+            "KALSHI-ACCESS-TIMESTAMP": timestamp
+        }
+        session = await self._get_kalshi_session()
+        async with self._kalshi_sem:
+            async with session.get(f"{client.base_url}{full_path}", headers=headers) as resp:
+                if resp.status != 200:
+                    # Rate limits and server errors matter with up to _kalshi_concurrency
+                    # calls in flight; other statuses (e.g. 404 on a closed market) are routine
+                    level = logging.WARNING if resp.status == 429 or resp.status >= 500 else logging.DEBUG
+                    logger.log(level, "  LongshotWeather: Kalshi GET %s returned %d", endpoint, resp.status)
+                    return None
+                return _json_loads(await resp.read())
+    
+    async def _fetch_series_markets(self, series: str) -> List[Dict]:
+        """Fetch markets for one series (empty list on error)"""
         try:
-            response = self.client._request("GET", "/series")
-            all_series = response.json().get('series', [])
-            climate_series = [s['ticker'] for s in all_series if 'Climate' in s.get('category', '') or 'Weather' in s.get('category', '')]
-            logger.info(f"  LongshotWeather: Found {len(climate_series)} climate/weather series")
+            data = await self._kalshi_get(f"/markets?series_ticker={series}&limit=20")
+            return (data or {}).get('markets', [])
         except Exception as e:
-            logger.error(f"  LongshotWeather: Error fetching series list: {e}")
-            climate_series = []
+            logger.debug(f"  LongshotWeather: Error fetching {series}: {e}")
+            return []
+    
+    async def _fetch_orderbooks(self, tickers: List[str]) -> List[Optional[Dict]]:
+        """
+        Fetch orderbooks concurrently, reusing any fetched in the last _orderbook_ttl seconds
         
-        # Get markets by series (not by status filter)
-        all_weather_markets = []
-        for series in climate_series[:50]:  # Limit to 50 series for performance
+        Tickers whose book had an empty side are skipped (None) for _orderbook_negative_ttl.
+        """
+        now = time.time()
+        results: List[Optional[Dict]] = [None] * len(tickers)
+        to_fetch = []
+        for i, ticker in enumerate(tickers):
+            empty_at = self._orderbook_negative.get(ticker)
+            if empty_at and now - empty_at < self._orderbook_negative_ttl:
+                continue
+            cached = self._orderbook_cache.get(ticker)
+            if cached and now - cached[0] < self._orderbook_ttl:
+                results[i] = cached[1]
+            else:
+                to_fetch.append(i)
+        
+        fetched = await asyncio.gather(
+            *[self._kalshi_get(f"/markets/{tickers[i]}/orderbook") for i in to_fetch],
+            return_exceptions=True
+        )
+        for i, orderbook in zip(to_fetch, fetched):
+            if orderbook and not isinstance(orderbook, Exception):
+                book = orderbook.get('orderbook') or {}
+                if not book.get('yes') or not book.get('no'):
+                    self._orderbook_negative[tickers[i]] = now
+                self._orderbook_cache[tickers[i]] = (now, orderbook)
+                results[i] = orderbook
+        
+        # Drop stale entries so the caches don't grow with every ticker ever seen
+        self._orderbook_cache = {
+            t: v for t, v in self._orderbook_cache.items() if now - v[0] < self._orderbook_ttl
+        }
+        self._orderbook_negative = {
+            t: ts for t, ts in self._orderbook_negative.items() if now - ts < self._orderbook_negative_ttl
+        }
+        return results
+    
+    async def _get_weather_markets(self) -> List[Dict]:
+        """
+        Discover weather markets via the climate/weather series
+        
+        Kalshi's markets endpoint has no category filter, so discovery costs one
+        series call plus one call per series (issued concurrently). The series
+        list is cached for _series_ttl and the resulting market list for _markets_ttl.
+        """
+        now = time.time()
+        if self._markets_cache and now - self._markets_cache[0] < self._markets_ttl:
+            return self._markets_cache[1]
+        
+        # Fetch ALL climate/weather series dynamically
+        if self._series_cache and now - self._series_cache[0] < self._series_ttl:
+            climate_series = self._series_cache[1]
+        else:
             try:
-                response = self.client._request("GET", f"/markets?series_ticker={series}&limit=20")
-                markets = response.json().get('markets', [])
-                all_weather_markets.extend(markets)
+                data = await self._kalshi_get("/series")
+                all_series = (data or {}).get('series', [])
+                if not all_series:
+                    # Failed/empty response (e.g. 429) - don't cache it for _series_ttl,
+                    # reuse the last good list if there is one and retry next scan
+                    raise RuntimeError("empty or failed /series response")
+                climate_series = [s for s in all_series if 'Climate' in s.get('category', '') or 'Weather' in s.get('category', '')]
+                # Only series for a city we can forecast - the rest would cost a
+                # markets call and orderbook probes just to be dropped in _parse_market
+                city_series = [
+                    s['ticker'] for s in climate_series
+                    if s['ticker'] in SERIES_TO_CITY
+                    or self.extract_city_from_market(s.get('title', ''), s['ticker'])[0]
+                ]
+                logger.info(f"  LongshotWeather: Found {len(climate_series)} climate/weather series, "
+                            f"{len(city_series)} for known cities")
+                climate_series = city_series
+                self._series_cache = (now, climate_series)
             except Exception as e:
-                logger.debug(f"  LongshotWeather: Error fetching {series}: {e}")
-                continue
+                logger.error(f"  LongshotWeather: Error fetching series list: {e}")
+                climate_series = self._series_cache[1] if self._series_cache else []
+        
+        # Get markets by series (not by status filter)
+        results = await asyncio.gather(
+            *[self._fetch_series_markets(series) for series in climate_series[:50]]  # Limit to 50 series for performance
+        )
+        all_weather_markets = [m for markets in results for m in markets]
+        
+        if all_weather_markets:
+            self._markets_cache = (now, all_weather_markets)
+        return all_weather_markets
+    
+    async def scan(self) -> List[Dict]:
+        """Scan for longshot weather opportunities - DYNAMIC DISCOVERY"""
+        opportunities = []
+        
+        # No forecast source available and nothing cached - every market would be
+        # dropped after analysis, so skip the Kalshi discovery/orderbook work entirely
+        if (self._weather_backing_off('openweather') and self._weather_backing_off('open-meteo')
+                and not self._has_fresh_forecasts()):
+            logger.warning("  LongshotWeather: No weather data available, skipping scan")
+            return opportunities
+        
+        logger.info("  LongshotWeather: Dynamically discovering liquid weather markets...")
+        
+        all_weather_markets = await self._get_weather_markets()
         
         logger.info(f"  LongshotWeather: Found {len(all_weather_markets)} total weather markets from series")
         
-        # First pass: Find weather markets with ACTUAL LIQUIDITY
-        liquid_weather = []
+        # First pass: Parse every market once (city, threshold, date - no network
+        # needed) and keep only those we can analyse. Markets whose payload
+        # top-of-book shows neither side near cheap never get an orderbook probe
+        max_bid_cents = self.max_market_price * 100 + self.prefilter_buffer_cents
+        candidates = []
+        seen_tickers = set()
         for m in all_weather_markets:
-            title = m.get('title', '')
             ticker = m.get('ticker', '')
-            
-            # Check for liquidity (this is the key filter)
-            try:
-                orderbook_response = self.client.get_orderbook(ticker)
-                # Kalshi returns {'orderbook': {'yes': [...], 'no': [...]}}
-                orderbook = orderbook_response.get('orderbook', {})
-                yes_bids = orderbook.get('yes', [])
-                no_bids = orderbook.get('no', [])
-                
-                if yes_bids and no_bids:
-                    # Prices are in format [[price_cents, volume], ...]
-                    yes_price_cents = yes_bids[0][0] if isinstance(yes_bids[0], list) else yes_bids[0].get('price', 100)
-                    no_price_cents = no_bids[0][0] if isinstance(no_bids[0], list) else no_bids[0].get('price', 100)
-                    
-                    yes_price = yes_price_cents / 100
-                    no_price = no_price_cents / 100
-                    
-                    # Only keep markets with actual prices
-                    liquid_weather.append({
-                        'market': m,
-                        'ticker': ticker,
-                        'title': title,
-                        'yes_price': yes_price,
-                        'no_price': no_price,
-                        'volume': m.get('volume', 0)
-                    })
-                    
-                    # Debug log first few liquid markets found
-                    if len(liquid_weather) <= 3:
-                        logger.info(f"  LongshotWeather: Found liquid - {ticker[:30]} YES={yes_price:.1%} NO={no_price:.1%}")
-            except Exception as e:
-                # Debug log errors for first few markets
-                if len(liquid_weather) < 3:
-                    logger.debug(f"  LongshotWeather: Error on {ticker[:30]}: {str(e)[:50]}")
+            if ticker in seen_tickers:
                 continue
+            seen_tickers.add(ticker)
+            yes_bid = m.get('yes_bid')
+            no_bid = m.get('no_bid')
+            if yes_bid is not None and no_bid is not None and min(yes_bid, no_bid) >= max_bid_cents:
+                continue
+            features = self._parse_market(m.get('title', ''), ticker)
+            if features:
+                candidates.append((m, features))
         
-        logger.info(f"  LongshotWeather: Found {len(liquid_weather)} weather markets WITH LIQUIDITY")
+        # Fetch forecasts for every candidate city (once per city per scan) in the
+        # background while the orderbooks below are fetched
+        city_coords = {features['city']: features['city_data'] for _, features in candidates}
+        if not city_coords:
+            return opportunities
+        forecasts_task = asyncio.create_task(self._fetch_forecasts(city_coords))
         
-        # Second pass: Filter for cheap markets and extract cities
-        cheap_markets = []
-        for item in liquid_weather:
-            yes_price = item['yes_price']
-            no_price = item['no_price']
+        try:
+            # Second pass: Check liquidity for the survivors, orderbooks fetched concurrently
+            orderbooks = await self._fetch_orderbooks([m.get('ticker', '') for m, _ in candidates])
             
-            # Check if either side is cheap
-            if yes_price < self.max_market_price or no_price < self.max_market_price:
-                # Determine which side is cheap
-                if yes_price < no_price:
-                    market_price = yes_price
-                    side = 'YES'
-                else:
-                    market_price = no_price
-                    side = 'NO'
+            liquid_weather = []
+            # Level format is fixed per API version - resolve the row parser once
+            parse_row = self._ob_parser
+            for (m, features), orderbook_response in zip(candidates, orderbooks):
+                # Check for liquidity (this is the key filter)
+                if not orderbook_response:
+                    continue
+                # Kalshi returns {'orderbook': {'yes': [...], 'no': [...]}}
+                orderbook = orderbook_response.get('orderbook') or {}
+                yes_bids = orderbook.get('yes')
+                no_bids = orderbook.get('no')
+                if not yes_bids or not no_bids:
+                    continue
+                
+                if parse_row is None:
+                    parse_row = self._ob_parser = _orderbook_row_parser(yes_bids[0])
+                # Levels ascend by price - the best bid on each side is the last one,
+                # the same top-of-book the payload prefilter's yes_bid/no_bid report
+                try:
+                    yes_price_cents = parse_row(yes_bids[-1])
+                    no_price_cents = parse_row(no_bids[-1])
+                except (KeyError, IndexError, TypeError, AttributeError):
+                    # Book in a different level format than the cached accessor -
+                    # re-resolve it, and skip just this market if the rows are malformed
+                    parse_row = self._ob_parser = _orderbook_row_parser(yes_bids[-1])
+                    try:
+                        yes_price_cents = _best_price_cents(yes_bids)
+                        no_price_cents = _best_price_cents(no_bids)
+                    except (KeyError, IndexError, TypeError, AttributeError):
+                        continue
+                if yes_price_cents is None or no_price_cents is None:
+                    continue
                 
-                # Extract city
-                city, city_data = self.extract_city_from_market(item['title'], item['ticker'])
+                ticker = m.get('ticker', '')
+                yes_price = yes_price_cents / 100
+                no_price = no_price_cents / 100
+                
+                # Only keep markets with actual prices
+                liquid_weather.append(MarketCandidate(
+                    ticker=ticker,
+                    title=m.get('title', ''),
+                    yes_price=yes_price,
+                    no_price=no_price,
+                    volume=m.get('volume', 0),
+                    **features
+                ))
                 
-                if city and city_data:
-                    cheap_markets.append({
-                        **item,
-                        'market_price': market_price,
-                        'side': side,
-                        'city': city,
-                        'city_data': city_data
-                    })
-        
-        logger.info(f"  LongshotWeather: Found {len(cheap_markets)} cheap weather markets (<{self.max_market_price:.0%})")
-        
-        # Log discovered markets for visibility
-        if cheap_markets:
-            logger.info(f"  LongshotWeather: Discovered liquid markets in: {', '.join(set(m['city'] for m in cheap_markets))}")
-            # Log first few cheap markets
-            for m in cheap_markets[:3]:
-                logger.info(f"  LongshotWeather: Cheap market - {m['ticker'][:30]} {m['side']}={m['market_price']:.1%}")
+                # Debug log first few liquid markets found
+                if len(liquid_weather) <= 3:
+                    logger.debug("  LongshotWeather: Found liquid - %s YES=%.1f%% NO=%.1f%%",
+                                 ticker[:30], yes_price * 100, no_price * 100)
+            
+            # Third pass: Filter for cheap markets
+            cheap_markets = []
+            for item in liquid_weather:
+                yes_price = item.yes_price
+                no_price = item.no_price
+                
+                # Check if either side is cheap
+                if yes_price < self.max_market_price or no_price < self.max_market_price:
+                    # Determine which side is cheap
+                    if yes_price < no_price:
+                        item.market_price = yes_price
+                        item.side = 'YES'
+                    else:
+                        item.market_price = no_price
+                        item.side = 'NO'
+                    
+                    cheap_markets.append(item)
+            
+            # Log discovered markets for visibility
+            if cheap_markets and logger.isEnabledFor(logging.INFO):
+                logger.info("  LongshotWeather: Discovered liquid markets in: %s",
+                            ', '.join({m.city for m in cheap_markets}))
+                # Log first few cheap markets
+                for m in cheap_markets[:3]:
+                    logger.debug("  LongshotWeather: Cheap market - %s %s=%.1f%%",
+                                 m.ticker[:30], m.side, m.market_price * 100)
+        except BaseException:
+            # Don't leave the forecast fetch running unawaited if anything above fails
+            forecasts_task.cancel()
+            raise
         
-        # Analyze each cheap market
+        forecast_by_city = await forecasts_task
         
         # Analyze each cheap market
+        # Collect parallel columns first, then score every market in one batch
+        parsed = []       # (item, daily_forecast)
+        highs = []
+        lows = []
+        thresholds = []
+        is_above_col = []  # None for range markets
         for item in cheap_markets:
-            market = item['market']
-            city = item['city']
-            city_data = item['city_data']
-            market_price = item['market_price']
-            ticker = item['ticker']
-            title = item['title']
-            cheap_side = item['side']
-            
             # Get weather forecast
-            forecast = await self.fetch_weather_forecast(city, city_data['lat'], city_data['lon'])
+            forecast = forecast_by_city.get(item.city)
             
             if not forecast:
                 continue
             
-            # Parse market to extract threshold and date
-            import re
-            
-            # Try to extract threshold (e.g., "will be >37°" or "will be 29-30°")
-            threshold = None
-            is_above = True
+            # Get forecast for relevant date
+            forecast_date = item.forecast_date
+            daily_forecast = forecast.get(forecast_date)
             
-            # Pattern: >37 or <30
-            match = re.search(r'[><](\d+)', title)
-            if match:
-                threshold = int(match.group(1))
-                is_above = '>' in title
+            if not daily_forecast:
+                logger.debug("  LongshotWeather: No forecast for %s (%s), have=%s",
+                             forecast_date, item.city, forecast.keys())
+                continue
             
-            # Pattern: 29-30 (range)
-            match = re.search(r'(\d+)-(\d+)', title)
-            if match:
-                threshold = (int(match.group(1)) + int(match.group(2))) / 2
-                is_above = None  # Range market
+            parsed.append((item, daily_forecast))
+            highs.append(daily_forecast['high'])
+            lows.append(daily_forecast['low'])
+            thresholds.append(item.threshold)
+            is_above_col.append(item.is_above)
+        
+        # Calculate fair probability with deviation for all markets at once
+        deviation_f = self.deviation_f
+        min_edge = self.min_edge
+        fair_probs = self.calculate_probabilities_batch(highs, lows, thresholds, is_above_col)
+        for i, (item, daily_forecast) in enumerate(parsed):
+            if is_above_col[i] is None:
+                # Range market - simplified probability
+                diff = abs(daily_forecast['avg'] - thresholds[i])
+                fair_probs[i] = 0.7 if diff < deviation_f else 0.3
+        
+        # Calculate edge using $64K formula
+        edges = self.calculate_edges_batch(fair_probs, [item.market_price for item, _ in parsed])
+        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for (item, daily_forecast), threshold, is_above, fair_prob, edge in zip(parsed, thresholds, is_above_col, fair_probs, edges):
+            ticker = item.ticker
+            market_price = item.market_price
+            if is_above is None:
+                forecast_temp = daily_forecast['avg']
+            else:
+                forecast_temp = daily_forecast['high'] if is_above else daily_forecast['low']
             
-            if threshold is None:
-                continue
+            # Per-market analysis only at DEBUG - formatting is skipped otherwise
+            if debug:
+                logger.debug("  LongshotWeather: %s... %s=%.1f%%, Fair=%.1f%%, Edge=%.1f%% (need >%.1f%%)",
+                             ticker[:30], item.side, market_price * 100, fair_prob * 100,
+                             edge * 100, min_edge * 100)
             
-            # Get forecast for relevant date
-            # Try to extract date from ticker (format: YY-MMM-DD in series, e.g., KXHIGHNY-26FEB03-T37)
-            # Pattern: 2-digit year, 3-letter month, 2-digit day
-            date_match = re.search(r'-\d{2}([A-Z]{3})(\d{2})-', ticker)
-            if date_match:
-                month_str = date_match.group(1)
-                day = date_match.group(2)
-                months = {'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6}
-                month = months.get(month_str, 2)
-                
-                forecast_date = f"2026-{month:02d}-{int(day):02d}"
-                daily_forecast = forecast.get(forecast_date)
-                
-                # DEBUG: Log forecast lookup
-                if len(opportunities) < 3 and daily_forecast:
-                    logger.info(f"  LongshotWeather: DEBUG {ticker[:20]}... date={forecast_date}, forecast={daily_forecast}")
-                
-                if not daily_forecast:
-                    if len(opportunities) < 3:
-                        logger.info(f"  LongshotWeather: DEBUG No forecast for {forecast_date}, have={list(forecast.keys())[:3]}")
-                    continue
-                
-                # Calculate fair probability with deviation
-                if is_above is not None:
-                    # Above/below market
-                    forecast_temp = daily_forecast['high'] if is_above else daily_forecast['low']
-                    fair_prob = self.calculate_probability_with_deviation(
-                        daily_forecast['high'], daily_forecast['low'],
-                        threshold, is_above
-                    )
-                else:
-                    # Range market - simplified probability
-                    range_center = threshold
-                    forecast_temp = daily_forecast['avg']
-                    diff = abs(forecast_temp - range_center)
-                    if diff < self.deviation_f:
-                        fair_prob = 0.7
-                    else:
-                        fair_prob = 0.3
-                
-                # Calculate edge using $64K formula
-                edge = self.calculate_edge(fair_prob, market_price)
-                
-                # Log every market analysis
-                logger.info(f"  LongshotWeather: {ticker[:30]}... "
-                           f"{item['side']}={market_price:.1%}, Fair={fair_prob:.1%}, "
-                           f"Edge={edge:.1%} (need >{self.min_edge:.1%})")
-                
-                # Only trade if edge > threshold (cheap markets need bigger edge)
-                if edge > self.min_edge:
-                    logger.info(f"  LongshotWeather: ✅ EDGE PASSED - {edge:.1%} > {self.min_edge:.1%}")
-                    opp = {
-                        'ticker': ticker,
-                        'market': title,
-                        'city': city,
-                        'market_price': market_price,
-                        'fair_probability': fair_prob,
-                        'expected_value': edge,
-                        'edge_formula': '(fair - market) / market',
-                        'forecast_temp': forecast_temp,
-                        'threshold': threshold,
-                        'deviation': self.deviation_f,
-                        'strategy': 'longshot_weather'
-                    }
-                    opportunities.append(opp)
-                    logger.info(f"  LongshotWeather: ✅ FOUND - Edge {edge:.1%} > {self.min_edge:.1%}")
-                else:
-                    logger.info(f"  LongshotWeather: Edge {edge:.1%} too small")
+            # Only trade if edge > threshold (cheap markets need bigger edge)
+            if edge > min_edge:
+                # Winners go back out in the plain opportunity dict shape execute() expects
+                opp = {
+                    'ticker': ticker,
+                    'market': item.title,
+                    'city': item.city,
+                    'market_price': market_price,
+                    'fair_probability': fair_prob,
+                    'expected_value': edge,
+                    'edge_formula': '(fair - market) / market',
+                    'forecast_temp': forecast_temp,
+                    'threshold': threshold,
+                    'deviation': deviation_f,
+                    'strategy': 'longshot_weather'
+                }
+                opportunities.append(opp)
+                logger.info(f"  LongshotWeather: ✅ FOUND - {ticker[:30]} Edge {edge:.1%} > {min_edge:.1%}")
+            elif debug:
+                logger.debug("  LongshotWeather: Edge %.1f%% too small", edge * 100)
         
+        # One summary line per scan instead of per-stage/per-market INFO logs
+        logger.info("  LongshotWeather: scanned=%d candidates=%d liquid=%d cheap(<%.0f%%)=%d analysed=%d edges_passed=%d",
+                    len(all_weather_markets), len(candidates), len(liquid_weather), self.max_market_price * 100,
+                    len(cheap_markets), len(parsed), len(opportunities))
         return opportunities
     
     async def execute(self, opportunities: List[Dict]) -> int:
@@ -468,11 +981,12 @@ class LongshotWeatherStrategy(BaseStrategy):
             else:
                 # REAL: Execute via Kalshi API
                 try:
-                    result = self.client.place_order(
-                        market_id=ticker,
-                        side='yes',
-                        price=market_price_cents,
-                        count=min(self.max_position, 5)
+                    result = await self._kalshi_call(
+                        self.client.place_order,
+                        ticker,
+                        'yes',
+                        market_price_cents,
+                        min(self.max_position, 5)
                     )
                     if result.get('order_id'):
                         recorded = self.record_position(
@@ -540,18 +1054,21 @@ class LongshotWeatherStrategy(BaseStrategy):
             'trades': len(self.trades)
     }
     
-    def _get_actual_fee_from_api(self, ticker: str, count: int) -> float:
-        """Fetch actual fee paid from API fills for a given ticker and count"""
+    async def _get_fill_fees(self) -> Dict[Tuple[str, int], float]:
+        """
+        Actual fees paid from API fills, keyed by (ticker, count)
+        
+        Fetched once per exit cycle; the first (most recent) fill wins for a key.
+        """
+        fees = {}
         try:
-            response = self.client._request("GET", "/portfolio/fills")
-            if response.status_code == 200:
-                fills = response.json().get('fills', [])
-                for fill in fills:
-                    if fill.get('ticker') == ticker and fill.get('count') == count:
-                        return float(fill.get('fee_cost', 0))
+            data = await self._kalshi_get("/portfolio/fills")
+            if data:
+                for fill in data.get('fills', []):
+                    fees.setdefault((fill.get('ticker'), fill.get('count')), float(fill.get('fee_cost', 0)))
         except Exception as e:
-            logger.debug(f"Could not fetch fee for {ticker}: {e}")
-        return 0.0
+            logger.debug(f"Could not fetch fills for fees: {e}")
+        return fees
     
     def _estimate_sell_fee(self, count: int) -> float:
         """Estimate sell fee based on recent API data
@@ -571,13 +1088,22 @@ class LongshotWeatherStrategy(BaseStrategy):
         if self.dry_run:
             return  # Don't manage exits in simulation mode
         
-        if not self.trades:
+        open_trades = [t for t in self.trades if t.get('status') == 'open']
+        if not open_trades:
             return
         
-        for trade in self.trades:
-            if trade.get('status') != 'open':
-                continue
-            
+        # Current prices for every open position in one concurrent wave
+        orderbooks = await asyncio.gather(
+            *[self._kalshi_get(f"/markets/{t['ticker']}/orderbook") for t in open_trades],
+            return_exceptions=True
+        )
+        
+        # One fills request covers every trade still missing its buy fee
+        fill_fees = {}
+        if any(t.get('exit_strategy', {}).get('buy_fee') is None for t in open_trades):
+            fill_fees = await self._get_fill_fees()
+        
+        for trade, orderbook in zip(open_trades, orderbooks):
             ticker = trade['ticker']
             exit_strat = trade.get('exit_strategy', {})
             entry_price = exit_strat.get('entry_price', int(trade.get('market_price', 0.01) * 100))
@@ -585,7 +1111,7 @@ class LongshotWeatherStrategy(BaseStrategy):
             
             # Fetch actual buy fee from API if not already stored
             if exit_strat.get('buy_fee') is None:
-                exit_strat['buy_fee'] = self._get_actual_fee_from_api(ticker, position_size)
+                exit_strat['buy_fee'] = fill_fees.get((ticker, position_size), 0.0)
             buy_fee_cents = int(exit_strat.get('buy_fee', 0) * 100)  # Convert to cents
             
             # Estimate sell fee
@@ -595,15 +1121,16 @@ class LongshotWeatherStrategy(BaseStrategy):
             
             # Get current market price
             try:
-                orderbook = self.client.get_orderbook(ticker)
+                if isinstance(orderbook, Exception):
+                    raise orderbook
                 if not orderbook:
                     continue
                 
                 # Get best bid for YES side
-                yes_bids = orderbook.get('orderbook', {}).get('yes', [])
-                if not yes_bids:
+                best_yes = _best_price_cents(orderbook.get('orderbook', {}).get('yes'))
+                if best_yes is None:
                     continue
-                current_price = int(yes_bids[0].get('price', entry_price))
+                current_price = int(best_yes)
                 
                 tier1_price = exit_strat.get('tier1_price', entry_price * 4)  # 4x
                 tier2_price = exit_strat.get('tier2_price', entry_price * 6)  # 6x
@@ -673,6 +1200,8 @@ class LongshotWeatherStrategy(BaseStrategy):
                 logger.debug(f"Error checking exits for {ticker}: {e}")
     
     async def close(self):
-        """Close session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close HTTP sessions (safe to call more than once)"""
+        for session in (self.session, self._kalshi_session):
+            if session is not None and not session.closed:
+                await session.close()
+        self.session = self._kalshi_session = None
@@ -7,12 +7,34 @@ Logs all trades that WOULD have been made and calculates P&L.
 
 import asyncio
 import logging
-from typing import Dict, Optional
-from datetime import datetime, timezone, timedelta
+import time
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timezone
 from strategy_framework import BaseStrategy
+from competitor_tracker import PolymarketTracker
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 logger = logging.getLogger('PureCopyTrading')
 
+# (crypto, Kalshi 15-minute series) pairs we mirror
+_SERIES = (('BTC', 'KXBTC15M'), ('ETH', 'KXETH15M'), ('SOL', 'KXSOL15M'))
+
+# Polymarket slug prefix (upper-cased) -> our crypto symbol
+_CRYPTO_ALIASES = {'BITCOIN': 'BTC', 'ETHEREUM': 'ETH', 'SOLANA': 'SOL'}
+
+
+@lru_cache(maxsize=128)
+def _utc_hhmm(timestamp: int) -> str:
+    """'HH:MM UTC' for a Unix timestamp - trades in one window share the same few inputs"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%H:%M UTC')
+
 
 class PureCopyStrategy(BaseStrategy):
     """
@@ -27,8 +49,16 @@ class PureCopyStrategy(BaseStrategy):
         self.competitor_address = '0xe00740bce98a594e26861838885ab310ec3b548c'
         self.competitor_bankroll = 6800
         
-        self.seen_trades = set()
+        # Seen tx hashes in arrival order, oldest dropped past _seen_max -
+        # membership stays O(1) and memory stays flat however long we run
+        self.seen_trades: OrderedDict[str, None] = OrderedDict()
+        self._seen_max = 10_000
         self._running = False
+        # Created on first scan and kept for the strategy's lifetime - construction
+        # shells out to `pass` for credentials and the session keeps its connections
+        self._tracker = None
+        # Set by notify_trade() to cut the wait between polls short
+        self._wake = asyncio.Event()
         
         # SIMULATION PARAMETERS
         self.simulation_start_balance = 1000.00  # Starting with $1000
@@ -37,7 +67,12 @@ class PureCopyStrategy(BaseStrategy):
         
         # Current window tracking
         self.current_window_end = None
+        self._window_end_epoch = 0  # current_window_end as Unix seconds, for the per-poll check
         self.active_markets = {}  # crypto -> kalshi_ticker for current window
+        self._open_times: Dict[str, int] = {}  # kalshi_ticker -> open_time as Unix seconds (fixed per market)
+        # Short-lived Kalshi market snapshots: ticker -> (fetched_at, market)
+        self._market_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._market_ttl = 2.0
         
         # Track simulated positions
         self.simulated_positions = {}  # crypto -> {size, side, entry_price, ticker}
@@ -53,34 +88,48 @@ class PureCopyStrategy(BaseStrategy):
         logger.info("   No real trades will be executed")
         logger.info("=" * 70)
     
+    @staticmethod
+    def _get_current_window_epoch() -> Tuple[int, int]:
+        """Start and end of current 15-min window as Unix seconds"""
+        now = int(time.time())
+        start = now - now % 900
+        return start, start + 900
+    
     def _get_current_window_times(self):
         """Get start and end of current 15-min window"""
-        now = datetime.now(timezone.utc)
-        current_minute = now.minute
-        window_start_minute = (current_minute // 15) * 15
-        
-        window_start = now.replace(minute=window_start_minute, second=0, microsecond=0)
-        window_end = window_start + timedelta(minutes=15)
-        
-        return window_start, window_end
+        start, end = self._get_current_window_epoch()
+        return datetime.fromtimestamp(start, tz=timezone.utc), datetime.fromtimestamp(end, tz=timezone.utc)
     
     def _get_window_timestamp(self, dt: datetime):
         """Convert datetime to window timestamp string"""
         return dt.strftime('%H%M')
     
-    def _find_current_window_markets(self):
+    async def _find_current_window_markets(self):
         """Find ACTIVE markets for current 15-min window only"""
         window_start, window_end = self._get_current_window_times()
         self.current_window_end = window_end
+        self._window_end_epoch = int(window_end.timestamp())
         
         window_ts = self._get_window_timestamp(window_end)
         logger.info(f"🔍 Looking for markets ending at {window_ts} ({window_end.strftime('%H:%M UTC')})")
         
+        end_epoch = self._window_end_epoch
+        end_minute_of_day = (end_epoch // 60) % 1440
+        
         self.active_markets = {}
+        self._open_times.clear()
+        self._market_cache.clear()
+        
+        # One market-list request per series, all in flight at once
+        results = await asyncio.gather(
+            *[asyncio.to_thread(self.client.get_markets, series_ticker=series, limit=20) for _, series in _SERIES],
+            return_exceptions=True
+        )
         
-        for crypto, series in [('BTC', 'KXBTC15M'), ('ETH', 'KXETH15M'), ('SOL', 'KXSOL15M')]:
+        for (crypto, series), markets in zip(_SERIES, results):
             try:
-                markets = self.client.get_markets(series_ticker=series, limit=20)
+                if isinstance(markets, Exception):
+                    raise markets
                 
                 for m in markets:
                     ticker = m.get('ticker', '')
@@ -91,8 +140,9 @@ class PureCopyStrategy(BaseStrategy):
                         continue
                     
                     if close_time:
-                        close_dt = datetime.fromisoformat(close_time.replace('Z', '+00:00'))
-                        if close_dt == window_end or close_dt.strftime('%H%M') == window_ts:
+                        # Exact close, or same HH:MM - compared as integers, no per-market strftime
+                        close_ts = int(datetime.fromisoformat(close_time).timestamp())
+                        if close_ts == end_epoch or (close_ts // 60) % 1440 == end_minute_of_day:
                             self.active_markets[crypto] = ticker
                             logger.info(f"  ✅ {crypto}: {ticker}")
                             break
@@ -102,19 +152,27 @@ class PureCopyStrategy(BaseStrategy):
         
         return len(self.active_markets) > 0
     
-    def _check_window_change(self):
-        """Check if we've moved to a new window"""
-        now = datetime.now(timezone.utc)
-        
-        if self.current_window_end and now >= self.current_window_end:
+    async def _check_window_change(self, now: Optional[float] = None):
+        """Check if we've moved to a new window (now: Unix seconds, defaults to the current time)"""
+        if now is None:
+            now = time.time()
+        if self._window_end_epoch and now >= self._window_end_epoch:
             logger.info(f"🔄 Window expired - settling positions")
             self._settle_window_positions()
             logger.info("   Finding markets for NEW window...")
-            self.seen_trades.clear()
-            return self._find_current_window_markets()
+            return await self._find_current_window_markets()
         
         return False
     
+    def _mark_seen(self, tx_hash: str) -> bool:
+        """Record tx_hash as seen; False if it already was"""
+        if tx_hash in self.seen_trades:
+            return False
+        self.seen_trades[tx_hash] = None
+        if len(self.seen_trades) > self._seen_max:
+            self.seen_trades.popitem(last=False)
+        return True
+    
     def _settle_window_positions(self):
         """Settle all positions at window end (0 or 100 based on market outcome)"""
         logger.info("📊 SETTLING WINDOW POSITIONS:")
@@ -166,20 +224,77 @@ class PureCopyStrategy(BaseStrategy):
         else:
             return 3
     
+    def _get_open_time(self, ticker: str) -> Optional[int]:
+        """Kalshi market open time in Unix seconds, fetched once per market (None if unavailable)"""
+        open_ts = self._open_times.get(ticker)
+        if open_ts is None:
+            m = self._get_market(ticker)
+            kalshi_open = m.get('open_time', '') if m else ''
+            if not kalshi_open:
+                return None
+            open_ts = self._open_times[ticker] = int(datetime.fromisoformat(kalshi_open).timestamp())
+        return open_ts
+    
+    def _get_market(self, ticker: str) -> Optional[Dict]:
+        """
+        Kalshi market snapshot, reused for _market_ttl seconds (None if not 200)
+        
+        Price logging, sells and settlement often read the same market within
+        one loop iteration; they share one request instead of one each.
+        """
+        now = time.monotonic()
+        cached = self._market_cache.get(ticker)
+        if cached and now - cached[0] < self._market_ttl:
+            return cached[1]
+        r = self.client._request("GET", f"/markets/{ticker}")
+        if r.status_code != 200:
+            return None
+        market = _json_loads(r.content).get('market', {})
+        self._market_cache[ticker] = (now, market)
+        return market
+    
+    def _get_markets(self, tickers) -> Dict[str, Dict]:
+        """
+        Snapshots for several markets: fresh cache hits plus ONE batched
+        /markets?tickers= request for the rest. Missing tickers are omitted.
+        """
+        now = time.monotonic()
+        result = {}
+        missing = []
+        for ticker in tickers:
+            cached = self._market_cache.get(ticker)
+            if cached and now - cached[0] < self._market_ttl:
+                result[ticker] = cached[1]
+            else:
+                missing.append(ticker)
+        if missing:
+            r = self.client._request("GET", f"/markets?tickers={','.join(missing)}")
+            if r.status_code == 200:
+                for m in _json_loads(r.content).get('markets', []):
+                    ticker = m.get('ticker')
+                    if ticker in missing:
+                        self._market_cache[ticker] = (now, m)
+                        result[ticker] = m
+        return result
+    
     def _log_market_prices(self):
         """Log current market prices for all active markets"""
         logger.info("📊 MARKET PRICE CHECK:")
+        try:
+            markets = self._get_markets(self.active_markets.values())
+        except Exception as e:
+            logger.info(f"   Error {e}")
+            return
         for crypto, ticker in self.active_markets.items():
             try:
-                r = self.client._request("GET", f"/markets/{ticker}")
-                if r.status_code == 200:
-                    m = r.json().get('market', {})
+                m = markets.get(ticker)
+                if m is not None:
                     yes_bid = m.get('yes_bid', 0)
                     yes_ask = m.get('yes_ask', 0)
                     last = m.get('last_price', 0)
                     logger.info(f"   {crypto}: yes_bid={yes_bid}c, yes_ask={yes_ask}c, last={last}c")
                 else:
-                    logger.info(f"   {crypto}: Error {r.status_code}")
+                    logger.info(f"   {crypto}: Error fetching market")
             except Exception as e:
                 logger.info(f"   {crypto}: Error {e}")
     
@@ -236,9 +351,8 @@ class PureCopyStrategy(BaseStrategy):
         
         # Get current market price
         try:
-            r = self.client._request("GET", f"/markets/{ticker}")
-            if r.status_code == 200:
-                m = r.json().get('market', {})
+            m = self._get_market(ticker)
+            if m is not None:
                 exit_price = m.get('yes_bid', 0)  # What we can sell at
             else:
                 exit_price = 50  # Fallback
@@ -273,8 +387,6 @@ class PureCopyStrategy(BaseStrategy):
     
     async def scan(self):
         """Main loop - poll and simulate trades"""
-        from competitor_tracker import PolymarketTracker
-        
         self._running = True
         logger.info("🎮 SIMULATION STARTED")
         logger.info(f"   Start: ${self.simulation_start_balance:.2f}")
@@ -282,15 +394,27 @@ class PureCopyStrategy(BaseStrategy):
         logger.info("=" * 70)
         
         # Find initial markets
-        self._find_current_window_markets()
+        await self._find_current_window_markets()
+        
+        if self._tracker is None:
+            self._tracker = PolymarketTracker()
+        tracker = self._tracker
+        start_time = time.time()
         
-        tracker = PolymarketTracker()
-        start_time = datetime.now(timezone.utc)
+        # Fixed cadence on the monotonic clock: each poll is scheduled from the
+        # previous deadline, so the time spent polling doesn't push polls later
+        poll_interval = 5.0
+        next_poll = time.monotonic()
+        next_price_log = next_poll
         
         while self._running:
+            next_poll = max(next_poll + poll_interval, time.monotonic())
             try:
+                # One clock read per cycle, shared by every check below
+                now = time.time()
+                
                 # Check for 4-hour limit
-                elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
+                elapsed = now - start_time
                 if elapsed > 14400:  # 4 hours
                     logger.info("=" * 70)
                     logger.info("⏰ 4-HOUR SIMULATION COMPLETE")
@@ -298,88 +422,92 @@ class PureCopyStrategy(BaseStrategy):
                     break
                 
                 # Check for window change
-                self._check_window_change()
+                await self._check_window_change(now)
                 
                 # Log status
-                now = datetime.now(timezone.utc)
-                time_to_close = (self.current_window_end - now).total_seconds() if self.current_window_end else 0
+                time_to_close = self._window_end_epoch - now if self._window_end_epoch else 0
                 
-                # Log prices every minute
-                if int(elapsed) % 60 == 0:
-                    self._log_market_prices()
+                logger.info("💰 Sim Balance: $%.2f | Window: %dm | Pos: %s",
+                            self.simulated_balance, int(time_to_close / 60), list(self.simulated_positions))
                 
-                logger.info(f"💰 Sim Balance: ${self.simulated_balance:.2f} | Window: {int(time_to_close/60)}m | Pos: {list(self.simulated_positions.keys())}")
+                # Poll for trades - the tracker is blocking HTTP, so run it in a
+                # worker thread rather than stalling every other strategy's loop
+                fetch_activity = asyncio.to_thread(tracker.get_user_activity, self.competitor_address, 10)
                 
-                # Poll for trades
-                activity = tracker.get_user_activity(self.competitor_address, limit=10)
+                # Log prices every minute - Kalshi and Polymarket requests in parallel
+                if time.monotonic() >= next_price_log:
+                    next_price_log += 60
+                    _, activity = await asyncio.gather(asyncio.to_thread(self._log_market_prices), fetch_activity)
+                else:
+                    activity = await fetch_activity
                 
+                # Quiet polls return the same recent trades every time - one set
+                # comparison skips them without touching each trade
+                by_hash = {}
                 for trade in activity:
                     tx_hash = trade.get('transactionHash') or trade.get('transaction_hash', '')
-                    if not tx_hash or tx_hash in self.seen_trades:
+                    if tx_hash:
+                        by_hash.setdefault(tx_hash, trade)
+                if by_hash.keys() <= self.seen_trades.keys():
+                    by_hash = {}
+                
+                for tx_hash, trade in by_hash.items():
+                    if not self._mark_seen(tx_hash):
                         continue
                     
-                    self.seen_trades.add(tx_hash)
-                    
                     if trade.get('type') != 'TRADE':
                         continue
                     
-                    # Parse trade
-                    slug = trade.get('slug', '')
-                    side = trade.get('side', '')
-                    size_usd = float(trade.get('size', 0))
-                    price = float(trade.get('price', 0.5))
-                    
                     # Extract crypto and EXACT expiration from slug
                     # Format: eth-updown-15m-1234567890 (Unix timestamp)
+                    slug = trade.get('slug', '')
                     parts = slug.split('-')
                     if len(parts) < 4:
                         continue
                     
                     crypto = parts[0].upper()
-                    if crypto == 'BITCOIN':
-                        crypto = 'BTC'
-                    elif crypto == 'ETHEREUM':
-                        crypto = 'ETH'
-                    elif crypto == 'SOLANA':
-                        crypto = 'SOL'
+                    crypto = _CRYPTO_ALIASES.get(crypto, crypto)
+                    
+                    # Nothing to copy into - skip before any parsing or Kalshi lookups
+                    kalshi_ticker = self.active_markets.get(crypto)
+                    if not kalshi_ticker:
+                        continue
                     
                     # Get Polymarket OPEN timestamp (when window starts)
                     try:
                         pm_timestamp = int(parts[3])
-                        pm_open_dt = datetime.fromtimestamp(pm_timestamp, tz=timezone.utc)
-                        pm_open_str = pm_open_dt.strftime('%H:%M UTC')
                     except:
                         logger.debug(f"Could not parse timestamp from {slug}")
                         continue
                     
-                    if crypto not in self.active_markets:
-                        continue
-                    
                     # Verify Kalshi market matches Polymarket OPEN time
-                    kalshi_ticker = self.active_markets[crypto]
                     try:
-                        r = self.client._request("GET", f"/markets/{kalshi_ticker}")
-                        if r.status_code == 200:
-                            kalshi_open = r.json().get('market', {}).get('open_time', '')
-                            if kalshi_open:
-                                kalshi_dt = datetime.fromisoformat(kalshi_open.replace('Z', '+00:00'))
-                                # Check if they match (within 1 minute)
-                                time_diff = abs((kalshi_dt - pm_open_dt).total_seconds())
-                                if time_diff > 60:  # More than 1 minute difference
-                                    logger.info(f"⏭️  Skipping {crypto} - window mismatch")
-                                    logger.info(f"   PM open: {pm_open_str} | Kalshi open: {kalshi_dt.strftime('%H:%M UTC')} | Diff: {int(time_diff/60)}m")
-                                    continue
-                                else:
-                                    logger.info(f"✅ {crypto} window MATCH: {pm_open_str}")
-                            else:
-                                continue
-                        else:
+                        # Open time never changes for a market - only the first
+                        # trade in a window pays for the lookup
+                        kalshi_open = self._get_open_time(kalshi_ticker)
+                        if kalshi_open is None:
+                            continue
+                        # Check if they match (within 1 minute) - plain epoch seconds, no datetimes
+                        time_diff = abs(kalshi_open - pm_timestamp)
+                        if time_diff > 60:  # More than 1 minute difference
+                            if logger.isEnabledFor(logging.INFO):
+                                logger.info("⏭️  Skipping %s - window mismatch\n   PM open: %s | Kalshi open: %s | Diff: %dm",
+                                            crypto, _utc_hhmm(pm_timestamp), _utc_hhmm(kalshi_open),
+                                            int(time_diff / 60))
                             continue
+                        else:
+                            if logger.isEnabledFor(logging.INFO):
+                                logger.info("✅ %s window MATCH: %s", crypto, _utc_hhmm(pm_timestamp))
                     except Exception as e:
                         logger.debug(f"Error checking Kalshi open time: {e}")
                         continue
                     
-                    logger.info(f"🚨 distinct-baguette: {side} {crypto} ${size_usd:.2f} @ {price:.2f}")
+                    # Parse trade
+                    side = trade.get('side', '')
+                    size_usd = float(trade.get('size', 0))
+                    price = float(trade.get('price', 0.5))
+                    
+                    logger.info("🚨 distinct-baguette: %s %s $%.2f @ %.2f", side, crypto, size_usd, price)
                     
                     # Record baguette's trade
                     self.baguette_trades.append({
@@ -399,11 +527,20 @@ class PureCopyStrategy(BaseStrategy):
                         position_size = self._get_position_size(size_usd)
                         self._simulate_sell(crypto, position_size, price)
                 
-                await asyncio.sleep(5)
-                
             except Exception as e:
                 logger.error(f"Error in scan loop: {e}")
-                await asyncio.sleep(5)
+            
+            # Sleep until the next poll is due, or until notify_trade() wakes us
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, next_poll - time.monotonic()))
+                self._wake.clear()
+                next_poll = time.monotonic()
+            except asyncio.TimeoutError:
+                pass
+    
+    def notify_trade(self):
+        """Poll now instead of waiting out the interval (e.g. from a trade push feed)"""
+        self._wake.set()
     
     async def _print_final_report(self):
         """Print final simulation report"""
@@ -413,17 +550,13 @@ class PureCopyStrategy(BaseStrategy):
         
         # Settle any remaining positions at current market price
         logger.info("\nSettling remaining positions at current prices:")
+        try:
+            markets = self._get_markets([pos['ticker'] for pos in self.simulated_positions.values()])
+        except Exception:
+            markets = {}
         for crypto, pos in list(self.simulated_positions.items()):
-            ticker = pos['ticker']
-            try:
-                r = self.client._request("GET", f"/markets/{ticker}")
-                if r.status_code == 200:
-                    m = r.json().get('market', {})
-                    settle_price = m.get('yes_bid', 50)
-                else:
-                    settle_price = 50
-            except:
-                settle_price = 50
+            m = markets.get(pos['ticker'])
+            settle_price = m.get('yes_bid', 50) if m is not None else 50
             
             entry = pos['entry_price']
             size = pos['size']
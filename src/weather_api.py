@@ -5,7 +5,7 @@ Replaces Open-Meteo to avoid rate limiting
 
 import aiohttp
 import asyncio
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from weather_cache import WeatherCache
 
 
@@ -109,3 +109,68 @@ class WeatherAPI:
         """Close session"""
         if self.session and not self.session.closed:
             await self.session.close()
+
+
+class OpenMeteoProvider:
+    """
+    Open-Meteo multi-location client
+    One request returns daily forecasts for every city (no API key needed)
+    """
+    
+    BASE_URL = "https://api.open-meteo.com/v1/forecast"
+    
+    def __init__(self, cities: Dict[str, Dict]):
+        """
+        Args:
+            cities: City name -> {'lat': ..., 'lon': ...}
+        """
+        self.cities = cities
+    
+    async def fetch_all(self, session: aiohttp.ClientSession) -> Dict[str, Dict]:
+        """
+        Fetch daily forecasts for all cities in a single request
+        
+        Returns:
+            City name -> {'YYYY-MM-DD': {'high', 'low', 'avg'}} (°F, city-local dates).
+            Empty dict on any failure so callers can fall back per city.
+        """
+        names: List[str] = list(self.cities)
+        if not names:
+            return {}
+        
+        lats = ','.join(str(self.cities[c]['lat']) for c in names)
+        lons = ','.join(str(self.cities[c]['lon']) for c in names)
+        url = (
+            f"{self.BASE_URL}?latitude={lats}&longitude={lons}"
+            f"&daily=temperature_2m_max,temperature_2m_min,temperature_2m_mean"
+            f"&temperature_unit=fahrenheit&timezone=auto&forecast_days=7"
+        )
+        
+        try:
+            async with session.get(url, timeout=10) as response:
+                if response.status != 200:
+                    print(f"Open-Meteo API error: {response.status}")
+                    return {}
+                data = await response.json()
+        except Exception as e:
+            print(f"Open-Meteo fetch error: {e}")
+            return {}
+        
+        # Single location returns an object, multiple return a list in request order
+        if isinstance(data, dict):
+            data = [data]
+        
+        result = {}
+        for city, location in zip(names, data):
+            daily = location.get('daily', {})
+            result[city] = {
+                date: {'high': high, 'low': low, 'avg': avg}
+                for date, high, low, avg in zip(
+                    daily.get('time', []),
+                    daily.get('temperature_2m_max', []),
+                    daily.get('temperature_2m_min', []),
+                    daily.get('temperature_2m_mean', [])
+                )
+                if high is not None and low is not None and avg is not None
+            }
+        return result
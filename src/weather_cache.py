@@ -7,7 +7,7 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 
 class WeatherCache:
@@ -47,19 +47,29 @@ class WeatherCache:
         Returns:
             Forecast dict or None if not cached/expired
         """
+        entry = self.get_entry(city, lat, lon)
+        return entry[0] if entry else None
+    
+    def get_entry(self, city: str, lat: float, lon: float) -> Optional[Tuple[Dict, datetime]]:
+        """
+        Get cached forecast and the time it was cached, if it isn't expired
+        
+        Returns:
+            (forecast dict, cached_at) or None if not cached/expired
+        """
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT forecast_data, expires_at FROM weather_forecasts WHERE city = ?",
+                "SELECT forecast_data, cached_at, expires_at FROM weather_forecasts WHERE city = ?",
                 (city,)
             )
             row = cursor.fetchone()
             
             if row:
-                forecast_data, expires_at = row
+                forecast_data, cached_at, expires_at = row
                 expires = datetime.fromisoformat(expires_at)
                 
                 if datetime.now() < expires:
-                    return json.loads(forecast_data)
+                    return json.loads(forecast_data), datetime.fromisoformat(cached_at)
                 else:
                     # Cache expired, delete it
                     conn.execute("DELETE FROM weather_forecasts WHERE city = ?", (city,))
@@ -0,0 +1,327 @@
+"""
+Unit tests for LongshotWeather helpers
+Run with: python3 -m pytest tests/test_longshot_weather.py -v
+"""
+
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import strategies.longshot_weather as longshot_weather
+from strategies.longshot_weather import (
+    LongshotWeatherStrategy, _best_price_cents, _orderbook_row_parser, _prob_with_deviation
+)
+from weather_cache import WeatherCache
+
+
+@pytest.fixture
+def strategy(tmp_path, monkeypatch):
+    """Strategy with its forecast cache in a temp dir"""
+    monkeypatch.setattr(longshot_weather, 'WeatherCache', lambda: WeatherCache(str(tmp_path)))
+    return LongshotWeatherStrategy({}, client=None)
+
+
+class TestParseMarket:
+    """Ticker parsing: KXHIGHNY-26FEB03-T37 / -B29.5"""
+    
+    def test_threshold_above(self, strategy):
+        parsed = strategy._parse_market('Will the high be >37°?', 'KXHIGHNY-26FEB03-T37')
+        assert parsed['city'] == 'New York'
+        assert parsed['threshold'] == 37
+        assert parsed['is_above'] is True
+        assert parsed['forecast_date'] == '2026-02-03'
+    
+    def test_threshold_below(self, strategy):
+        parsed = strategy._parse_market('Will the high be <30°?', 'KXHIGHCHI-25DEC31-T30')
+        assert parsed['city'] == 'Chicago'
+        assert parsed['threshold'] == 30
+        assert parsed['is_above'] is False
+        assert parsed['forecast_date'] == '2025-12-31'
+    
+    def test_decimal_threshold(self, strategy):
+        parsed = strategy._parse_market('Will the high be >37.5°?', 'KXHIGHNY-26FEB03-T37.5')
+        assert parsed['threshold'] == 37.5
+        assert parsed['is_above'] is True
+    
+    def test_threshold_without_direction(self, strategy):
+        assert strategy._parse_market('High temp in NYC', 'KXHIGHNY-26FEB03-T37') is None
+    
+    def test_range(self, strategy):
+        parsed = strategy._parse_market('Will the high be 29-30°?', 'KXHIGHNY-26FEB03-B29.5')
+        assert parsed['threshold'] == 29.5
+        assert parsed['is_above'] is None
+    
+    def test_no_suffix_falls_back_to_title(self, strategy):
+        parsed = strategy._parse_market('Will the high be >41°?', 'KXHIGHNY-26MAR07-')
+        assert parsed['threshold'] == 41
+        assert parsed['is_above'] is True
+        assert parsed['forecast_date'] == '2026-03-07'
+        
+        parsed = strategy._parse_market('Will the high be 29-30°?', 'KXHIGHNY-26MAR07-')
+        assert parsed['threshold'] == 29.5
+        assert parsed['is_above'] is None
+    
+    def test_every_month(self, strategy):
+        months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+                  'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+        for number, month in enumerate(months, start=1):
+            parsed = strategy._parse_market('>37°', f'KXHIGHNY-26{month}03-T37')
+            assert parsed['forecast_date'] == f'2026-{number:02d}-03'
+    
+    def test_unknown_month(self, strategy):
+        assert strategy._parse_market('>37°', 'KXHIGHNY-26XYZ03-T37') is None
+    
+    def test_no_date(self, strategy):
+        assert strategy._parse_market('Will the high be >37°?', 'KXHIGHNY-T37') is None
+
+
+class TestExtractCity:
+    """Known cities are picked by self.cities order, not by position in the title"""
+    
+    def test_short_keys_inside_words(self, strategy):
+        # 'hou' (Houston) in "Hours" and 'sea' (Seattle) in "season" come first
+        assert strategy.extract_city_from_market('Hours of sunshine in NYC', 'KXSUN-26FEB03')[0] == 'New York'
+        assert strategy.extract_city_from_market('Snow this season in NYC?', 'KXSNOW-26FEB03')[0] == 'New York'
+    
+    def test_priority_over_title_position(self, strategy):
+        assert strategy.extract_city_from_market('Houston or Chicago warmer?', 'KXTEMP-26FEB03')[0] == 'Chicago'
+    
+    def test_ticker_key(self, strategy):
+        assert strategy.extract_city_from_market('Highest temperature today?', 'KXHIGHLAX-26FEB03-T70')[0] == 'Los Angeles'
+    
+    def test_fallback_city_by_name(self, strategy):
+        assert strategy.extract_city_from_market('High temp in Denver?', 'KXHIGHDEN-26FEB03')[0] == 'Denver'
+    
+    def test_unknown(self, strategy):
+        assert strategy.extract_city_from_market('High temp on Mars?', 'KXMARS-26FEB03') == (None, None)
+
+
+class TestProbWithDeviation:
+    """Linear ±deviation band, clamped to [0.15, 0.85]"""
+    
+    def test_at_threshold(self):
+        assert _prob_with_deviation(37, 30, 37, True, 3.5) == pytest.approx(0.5)
+        assert _prob_with_deviation(45, 37, 37, False, 3.5) == pytest.approx(0.5)
+    
+    def test_inside_band(self):
+        # 1.75°F above the threshold is a quarter of the 7°F band
+        assert _prob_with_deviation(38.75, 30, 37, True, 3.5) == pytest.approx(0.75)
+        assert _prob_with_deviation(45, 38.75, 37, False, 3.5) == pytest.approx(0.25)
+    
+    def test_above_uses_high_below_uses_low(self):
+        assert _prob_with_deviation(38, 20, 37, True, 3.5) == pytest.approx(0.5 + 1 / 7)
+        assert _prob_with_deviation(60, 36, 37, False, 3.5) == pytest.approx(0.5 + 1 / 7)
+    
+    def test_clamped_outside_band(self):
+        assert _prob_with_deviation(50, 40, 37, True, 3.5) == 0.85
+        assert _prob_with_deviation(20, 10, 37, True, 3.5) == 0.15
+        assert _prob_with_deviation(50, 40, 37, False, 3.5) == 0.15
+        assert _prob_with_deviation(20, 10, 37, False, 3.5) == 0.85
+    
+    def test_matches_strategy_method(self, strategy):
+        assert strategy.calculate_probability_with_deviation(38, 30, 37, True) == \
+            _prob_with_deviation(38, 30, 37, True, strategy.deviation_f)
+
+
+class TestBestPriceCents:
+    """Kalshi orderbook levels ascend by price - best bid is the last level"""
+    
+    def test_list_levels(self):
+        assert _best_price_cents([[1, 10], [3, 7], [5, 3]]) == 5
+    
+    def test_dict_levels(self):
+        assert _best_price_cents([{'price': 1}, {'price': 3}, {'price': 5}]) == 5
+    
+    def test_single_level(self):
+        assert _best_price_cents([[42, 1]]) == 42
+    
+    def test_empty(self):
+        assert _best_price_cents([]) is None
+        assert _best_price_cents(None) is None
+
+
+class TestGetWeatherMarkets:
+    """Series discovery caching"""
+    
+    @staticmethod
+    def _stub_kalshi(strategy, responses):
+        calls = []
+        
+        async def kalshi_get(endpoint):
+            calls.append(endpoint)
+            if endpoint == '/series':
+                return responses.pop(0)
+            return {'markets': [{'ticker': endpoint}]}
+        
+        strategy._kalshi_get = kalshi_get
+        return calls
+    
+    def test_failed_series_not_cached(self, strategy):
+        healthy = {'series': [{'ticker': 'KXHIGHNY', 'category': 'Climate and Weather'}]}
+        calls = self._stub_kalshi(strategy, [None, healthy])
+        
+        assert asyncio.run(strategy._get_weather_markets()) == []
+        markets = asyncio.run(strategy._get_weather_markets())
+        
+        assert calls.count('/series') == 2
+        assert markets == [{'ticker': '/markets?series_ticker=KXHIGHNY&limit=20'}]
+    
+    def test_failure_reuses_last_good_series(self, strategy):
+        healthy = {'series': [{'ticker': 'KXHIGHNY', 'category': 'Climate and Weather'}]}
+        calls = self._stub_kalshi(strategy, [healthy, None])
+        
+        asyncio.run(strategy._get_weather_markets())
+        # Expire both caches so the next call refetches /series
+        strategy._series_cache = (0, strategy._series_cache[1])
+        strategy._markets_cache = None
+        markets = asyncio.run(strategy._get_weather_markets())
+        
+        assert calls.count('/series') == 2
+        assert markets == [{'ticker': '/markets?series_ticker=KXHIGHNY&limit=20'}]
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+    
+    async def read(self):
+        return json.dumps(self._payload).encode()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, status=200, payload=None):
+        self.status = status
+        self.payload = payload
+    
+    def get(self, url, headers=None):
+        return FakeResponse(self.status, self.payload)
+
+
+class TestFetchOnecallDaily:
+    
+    def test_avg_is_daily_mean(self, strategy):
+        payload = {
+            'timezone_offset': -18000,
+            'daily': [{
+                'dt': 1770138000,  # 2026-02-03 12:00 local (UTC-5)
+                'temp': {'min': 28.0, 'max': 44.0, 'morn': 30.0, 'day': 42.0, 'eve': 38.0, 'night': 34.0},
+            }],
+        }
+        session = FakeSession(payload=payload)
+        
+        result = asyncio.run(strategy._fetch_onecall_daily(session, 40.7, -74.0, 'key'))
+        
+        assert result == {'2026-02-03': {'high': 44.0, 'low': 28.0, 'avg': 36.0}}
+    
+    def test_unauthorized_disables_onecall(self, strategy):
+        result = asyncio.run(strategy._fetch_onecall_daily(FakeSession(status=401), 40.7, -74.0, 'key'))
+        
+        assert result is None
+        assert strategy._onecall_available is False
+
+
+class TestScanOrderbooks:
+    """Liquidity pass against the orderbook level format"""
+    
+    MARKETS = [
+        {'ticker': 'KXHIGHNY-26FEB03-T37', 'title': 'Will the high be >37°?', 'yes_bid': 5, 'no_bid': 90},
+        {'ticker': 'KXHIGHNY-26FEB03-T40', 'title': 'Will the high be >40°?', 'yes_bid': 5, 'no_bid': 90},
+    ]
+    
+    @staticmethod
+    def _stub(strategy, books, forecasts=None):
+        async def get_markets():
+            return TestScanOrderbooks.MARKETS
+        
+        async def fetch_orderbooks(tickers):
+            if isinstance(books, Exception):
+                raise books
+            return books
+        
+        async def fetch_forecasts(city_coords):
+            if forecasts is None:
+                await asyncio.sleep(3600)
+            return forecasts
+        
+        strategy._get_weather_markets = get_markets
+        strategy._fetch_orderbooks = fetch_orderbooks
+        strategy._fetch_forecasts = fetch_forecasts
+    
+    def test_format_change_and_malformed_rows(self, strategy):
+        # Accessor cached from a list-format book, then books arrive as dicts
+        strategy._ob_parser = _orderbook_row_parser([1, 10])
+        books = [
+            {'orderbook': {'yes': [{'price': 2}, {'price': 5}], 'no': [{'price': 80}, {'price': 90}]}},
+            {'orderbook': {'yes': [[]], 'no': [[]]}},  # Malformed - skipped, scan carries on
+        ]
+        forecasts = {'New York': {'2026-02-03': {'high': 45.0, 'low': 30.0, 'avg': 38.0}}}
+        self._stub(strategy, books, forecasts)
+        
+        opportunities = asyncio.run(strategy.scan())
+        
+        assert [o['ticker'] for o in opportunities] == ['KXHIGHNY-26FEB03-T37']
+        assert opportunities[0]['market_price'] == 0.05
+    
+    def test_error_cancels_forecast_fetch(self, strategy):
+        self._stub(strategy, RuntimeError('orderbooks down'))
+        
+        async def run():
+            with pytest.raises(RuntimeError):
+                await strategy.scan()
+            # Only the test's own task is left - the forecast fetch was cancelled
+            await asyncio.sleep(0)
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        
+        assert asyncio.run(run()) == []
+
+
+class FakeKalshiClient:
+    API_PREFIX = '/trade-api/v2'
+    base_url = 'https://kalshi.test'
+    api_key_id = 'key-id'
+    
+    def _create_signature(self, timestamp, method, path):
+        return 'sig'
+
+
+class TestKalshiGet:
+    
+    @staticmethod
+    def _get(strategy, status, payload=None):
+        strategy.client = FakeKalshiClient()
+        session = FakeSession(status=status, payload=payload)
+        
+        async def get_session():
+            return session
+        
+        strategy._get_kalshi_session = get_session
+        return asyncio.run(strategy._kalshi_get('/series'))
+    
+    def test_ok(self, strategy):
+        assert self._get(strategy, 200, {'series': []}) == {'series': []}
+    
+    def test_rate_limit_logged(self, strategy, caplog):
+        with caplog.at_level(logging.DEBUG):
+            assert self._get(strategy, 429) is None
+        assert [(r.levelno, r.getMessage()) for r in caplog.records if r.name == 'LongshotWeather'] == [
+            (logging.WARNING, '  LongshotWeather: Kalshi GET /series returned 429')
+        ]
+    
+    def test_not_found_logged_at_debug(self, strategy, caplog):
+        with caplog.at_level(logging.DEBUG):
+            assert self._get(strategy, 404) is None
+        assert [r.levelno for r in caplog.records if r.name == 'LongshotWeather'] == [logging.DEBUG]
@@ -0,0 +1,54 @@
+"""
+Unit tests for the cached pass lookup
+Run with: python3 -m pytest tests/test_secret_store.py -v
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import secret_store
+from secret_store import get_secret
+
+
+@pytest.fixture
+def fake_pass(monkeypatch):
+    """Replace `pass show` with a dict lookup, recording every call"""
+    entries = {'openweather/api-key': 'abc123\nurl: https://example.com\n'}
+    calls = []
+    
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        path = cmd[-1]
+        if path not in entries:
+            raise subprocess.CalledProcessError(1, cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=entries[path], stderr='')
+    
+    monkeypatch.setattr(secret_store.subprocess, 'run', run)
+    get_secret.cache_clear()
+    yield calls
+    get_secret.cache_clear()
+
+
+class TestGetSecret:
+    
+    def test_returns_first_line(self, fake_pass):
+        assert get_secret('openweather/api-key') == 'abc123'
+        assert fake_pass == [['pass', 'show', 'openweather/api-key']]
+    
+    def test_cached_per_path(self, fake_pass):
+        get_secret('openweather/api-key')
+        get_secret('openweather/api-key')
+        assert len(fake_pass) == 1
+    
+    def test_failures_not_cached(self, fake_pass):
+        with pytest.raises(subprocess.CalledProcessError):
+            get_secret('missing/entry')
+        with pytest.raises(subprocess.CalledProcessError):
+            get_secret('missing/entry')
+        assert len(fake_pass) == 2
@@ -0,0 +1,104 @@
+"""
+Unit tests for the Open-Meteo multi-location client
+Run with: python3 -m pytest tests/test_weather_api.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from weather_api import OpenMeteoProvider
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+    
+    async def json(self):
+        return self._payload
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Stands in for aiohttp.ClientSession, recording requested URLs"""
+    
+    def __init__(self, status=200, payload=None):
+        self.status = status
+        self.payload = payload
+        self.urls = []
+    
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return FakeResponse(self.status, self.payload)
+
+
+def _location(highs, lows, avgs, dates=('2026-02-03', '2026-02-04')):
+    return {'daily': {
+        'time': list(dates),
+        'temperature_2m_max': highs,
+        'temperature_2m_min': lows,
+        'temperature_2m_mean': avgs,
+    }}
+
+
+class TestOpenMeteoProvider:
+    """fetch_all: one request for every city"""
+    
+    def test_single_location(self):
+        # One location comes back as a bare object, not a list
+        provider = OpenMeteoProvider({'New York': {'lat': 40.7128, 'lon': -74.006}})
+        session = FakeSession(payload=_location([40.0, 42.0], [30.0, 31.0], [35.0, 36.5]))
+        
+        result = asyncio.run(provider.fetch_all(session))
+        
+        assert result == {'New York': {
+            '2026-02-03': {'high': 40.0, 'low': 30.0, 'avg': 35.0},
+            '2026-02-04': {'high': 42.0, 'low': 31.0, 'avg': 36.5},
+        }}
+        assert len(session.urls) == 1
+        assert 'latitude=40.7128&longitude=-74.006' in session.urls[0]
+    
+    def test_multiple_locations(self):
+        provider = OpenMeteoProvider({
+            'New York': {'lat': 40.7128, 'lon': -74.006},
+            'Chicago': {'lat': 41.8781, 'lon': -87.6298},
+        })
+        session = FakeSession(payload=[
+            _location([40.0, 42.0], [30.0, 31.0], [35.0, 36.5]),
+            _location([20.0, 22.0], [10.0, 11.0], [15.0, 16.5]),
+        ])
+        
+        result = asyncio.run(provider.fetch_all(session))
+        
+        assert len(session.urls) == 1
+        assert 'latitude=40.7128,41.8781&longitude=-74.006,-87.6298' in session.urls[0]
+        # Results map back to cities in request order
+        assert result['New York']['2026-02-03']['high'] == 40.0
+        assert result['Chicago']['2026-02-03']['high'] == 20.0
+        assert result['Chicago']['2026-02-04'] == {'high': 22.0, 'low': 11.0, 'avg': 16.5}
+    
+    def test_skips_days_with_missing_values(self):
+        provider = OpenMeteoProvider({'New York': {'lat': 40.7128, 'lon': -74.006}})
+        session = FakeSession(payload=_location([40.0, None], [30.0, 31.0], [35.0, 36.5]))
+        
+        result = asyncio.run(provider.fetch_all(session))
+        
+        assert list(result['New York']) == ['2026-02-03']
+    
+    def test_http_error_returns_empty(self):
+        provider = OpenMeteoProvider({'New York': {'lat': 40.7128, 'lon': -74.006}})
+        assert asyncio.run(provider.fetch_all(FakeSession(status=429))) == {}
+    
+    def test_no_cities_makes_no_request(self):
+        session = FakeSession()
+        assert asyncio.run(OpenMeteoProvider({}).fetch_all(session)) == {}
+        assert session.urls == []